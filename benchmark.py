@@ -14,14 +14,15 @@ def main():
     width, height, cycles = 50, 50, 100
     xA, yA, xB, yB = 1, 0, 100, 99
 
-    algs = [[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]]
-    funcs = [labyrinth.computer_solve_maze, labyrinth3_2.solve_maze, labyrinth3_3.solve_maze]
+    algs = [[0, 0, 0, 0, 0], [0, 0, 0, 0, 0], [0, 0, 0, 0, 0], [0, 0, 0, 0, 0]]
+    funcs = [labyrinth.computer_solve_maze, labyrinth3_2.solve_maze, labyrinth3_3.solve_maze, labyrinth.jps_solve_maze]
 
     start = time.time()
     for t in range(n):
         grid = labyrinth3_5.generate_maze(width, height, cycles)
         grid[yA][xA] = "A"
         grid[yB][xB] = "B"
+        field = labyrinth.distance_field(grid, xB, yB)
 
         for i in range(len(algs)):
             funcStart = time.time()
@@ -35,13 +36,14 @@ def main():
             algs[i][1] += length
             algs[i][2] += elapsed
             algs[i][3] += 1
+            algs[i][4] += length == field.distance_to_exit(xA, yA)
 
         elapsed = time.time() - start
         print("\rProgress: %d / %d (%f%%) - Elapsed: %f seconds - Remaining: %f seconds" % (t + 1, n, (t + 1) / n * 100, elapsed, elapsed / (t + 1) * (n - t - 1)), end="")
     print()
 
     for i in range(len(algs)):
-        print("Algorithm %d: %f average cells explored, %f average path length, %f average execution time" % (i + 1, algs[i][0] / algs[i][3], algs[i][1] / algs[i][3], algs[i][2] / algs[i][3]))
+        print("Algorithm %d: %f average cells explored, %f average path length, %f average execution time, %f%% shortest paths" % (i + 1, algs[i][0] / algs[i][3], algs[i][1] / algs[i][3], algs[i][2] / algs[i][3], algs[i][4] / algs[i][3] * 100))
 
 if __name__ == "__main__":
     main()
@@ -2,9 +2,27 @@
 
 import sys
 import time
+import heapq
 import random
 import curses
+import threading
 import traceback
+import collections
+import concurrent.futures
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Quadrant characters indexed by the walls of a block of 2 by 2 cells, with 1 for the top left, 2 for the top right, 4 for the bottom left and 8 for the bottom right.
+QUADRANTS = " ▘▝▀▖▌▞▛▗▚▐▜▄▙▟█"
+
+# Number of walls tried by generate_maze between two checks of its progress and cancellation.
+CHECK_INTERVAL = 1024
+
+# Delay in milliseconds between two updates of the progress bar while a maze is generated.
+PROGRESS_DELAY = 100
 
 def input_int(screen, prefix, validate):
     """
@@ -63,19 +81,6 @@ def generate_grid(width, height):
 
     return grid
 
-def is_maze_done(grid):
-    """
-    Returns True if and only if the specified grid only contains -1 and 0.
-    This means the randomized Kruskal's maze generation algorithm is completed.
-    """
-
-    for line in grid:
-        for cell in line:
-            if cell != -1 and cell != 0:
-                return False
-
-    return True
-
 def get_adjacent_cells(grid, x, y):
     """
     Returns all the adjacent valid cells to the one with the specified coordinates.
@@ -116,17 +121,36 @@ def propagate(grid, x, y):
         if grid[cell[1]][cell[0]] > minimum:
             propagate(grid, cell[0], cell[1])
 
-def generate_maze(width, height):
+def is_cancelled(cancel, deadline):
+    """
+    Returns True if and only if the specified cancel event is set, or if the specified deadline, a time as returned by time.time(), is passed.
+    Both are optional and ignored if they are None.
+    """
+
+    return (cancel is not None and cancel.is_set()) or (deadline is not None and time.time() >= deadline)
+
+def generate_maze(width, height, progress=None, cancel=None, deadline=None):
     """
     Generates a maze of the specified size using a derived and randomized form of Kruskal's maze generation algorithm.
     The grid returned is a two-dimensional list of integers.
     Its first dimension is of size the height specified and its second of size the width specified.
     -1 represents walls, spaces (" ") represent open cells.
+    The progress function, if specified, is called regularly with the fraction of the passages already opened.
+    The generation is stopped and None is returned shortly after the cancel event, if specified, is set, or after the deadline, if specified, is passed.
     """
 
     grid = generate_grid(width, height)
 
-    while not is_maze_done(grid):
+    # Each passage opened merges two sets of cells, so the maze is done once width * height - 1 passages are opened.
+    opened, total, tries = 0, width * height - 1, 0
+    while opened < total:
+        tries += 1
+        if tries % CHECK_INTERVAL == 0:
+            if is_cancelled(cancel, deadline):
+                return None
+            if progress is not None:
+                progress(opened / total)
+
         if random.getrandbits(1):
             # Horizontal
             x = random.randrange(width) * 2 + 1
@@ -143,6 +167,10 @@ def generate_maze(width, height):
                 continue
 
         propagate(grid, x, y)
+        opened += 1
+
+    if progress is not None:
+        progress(1)
 
     for y in range(1, height * 2):
         for x in range(1, width * 2):
@@ -151,26 +179,132 @@ def generate_maze(width, height):
 
     return grid
 
+def get_character(cell):
+    """
+    Returns the character used to display the specified cell.
+    Cells with -1 are replaced with stars ("*").
+    Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    """
+
+    characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
+    if cell == -1:
+        return "*"
+    elif type(cell) is int:
+        return characters[min(cell, len(characters) - 1)]
+    else:
+        return cell
+
+def get_row(line):
+    """
+    Returns the string used to display the specified row of a maze.
+    Cells with -1 are replaced with stars ("*").
+    Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    """
+
+    return " ".join(get_character(cell) for cell in line)
+
+def get_compact_row(top, bottom):
+    """
+    Returns the string used to display the two specified rows of a maze.
+    Each character represents a block of 2 by 2 cells, and uses a Unicode quadrant character showing which of the four cells are walls.
+    Blocks containing cells other than walls and spaces (" ") are replaced with the character of one of those cells, "A", "B" and "X" first.
+    """
+
+    if len(top) % 2:
+        top, bottom = top + [" "], bottom + [" "]
+
+    row = []
+    for x in range(0, len(top), 2):
+        block = (top[x], top[x + 1], bottom[x], bottom[x + 1])
+        marks = [cell for cell in block if cell != -1 and cell != " "]
+        if marks:
+            cell = next((cell for cell in marks if cell in ("A", "B", "X")), marks[0])
+            row.append(get_character(cell))
+        else:
+            row.append(QUADRANTS[sum(1 << i for i, cell in enumerate(block) if cell == -1)])
+
+    return "".join(row)
+
 def display_maze(screen, grid):
     """
     Displays the specified maze.
     Cells with -1 are replaced with stars ("*").
     Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    Only the part of the maze which fits in the screen is displayed, the rest of the rows and columns are cut off.
+    If the maze is wider than the screen, it is displayed by display_compact_maze instead.
     """
 
-    characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
-    for line in grid:
-        for cell in line:
-            if cell == -1:
-                screen.addstr("*")
-            elif type(cell) is int:
-                screen.addstr(characters[min(cell, len(characters) - 1)])
-            else:
-                screen.addstr(cell)
+    height, width = screen.getmaxyx()
+    top, _ = screen.getyx()
 
-            screen.addstr(" ")
+    if len(grid[0]) * 2 > width:
+        display_compact_maze(screen, grid)
+        return
 
-        screen.addstr("\n\r")
+    screen.addstr("".join(get_row(line[:width // 2]) + "\n\r" for line in grid[:max(height - top - 1, 0)]))
+
+def display_compact_maze(screen, grid):
+    """
+    Displays the specified maze using one character for each block of 2 by 2 cells, which takes 4 times less space than display_maze.
+    Only the part of the maze which fits in the screen is displayed, the rest of the rows and columns are cut off.
+    """
+
+    height, width = screen.getmaxyx()
+    top, _ = screen.getyx()
+
+    rows = range(0, min(len(grid), max(height - top - 1, 0) * 2), 2)
+    screen.addstr("".join(get_compact_row(grid[y][:width * 2 - 2], grid[y + 1][:width * 2 - 2] if y + 1 < len(grid) else [" "] * min(len(grid[y]), width * 2 - 2)) + "\n\r" for y in rows))
+
+def draw_cells(window, grid, cells):
+    """
+    Draws again only the specified cells of a maze displayed by display_maze or draw_maze at the top left corner of the specified window.
+    The window isn't refreshed, so that only the modified characters are sent to the terminal at the next update.
+    """
+
+    for x, y in cells:
+        window.addch(y, x * 2, get_character(grid[y][x]))
+
+def draw_maze(grid):
+    """
+    Creates and returns a pad containing the whole specified maze, drawn the same way as display_maze.
+    The pad can be larger than the screen, in which case only a part of it is displayed using display_viewport.
+    """
+
+    # An extra line is kept at the bottom, as curses fails to move the cursor after writing in the bottom right corner.
+    pad = curses.newpad(len(grid) + 1, len(grid[0]) * 2)
+
+    for y, line in enumerate(grid):
+        pad.addstr(y, 0, get_row(line))
+
+    return pad
+
+def scroll_viewport(start, length, size, position):
+    """
+    Returns the new start of a viewport of the specified length along one axis, so that the specified position is visible.
+    The viewport doesn't move while the position stays inside it, otherwise it is centered on the position.
+    It never goes past the specified size, unless the whole axis already fits in the viewport.
+    """
+
+    if position < start or position >= start + length:
+        start = position - length // 2
+
+    return max(min(start, size - length), 0)
+
+def display_viewport(screen, pad, grid, x, y, top, left):
+    """
+    Displays the part of the specified pad drawn by draw_maze which fits in the screen, scrolled so that the cell (x, y) is visible.
+    Only the visible part of the pad is copied to the screen, so the time taken doesn't depend on the size of the maze.
+    Returns the new top and left coordinates of the pad displayed at the top left corner of the screen.
+    """
+
+    height, width = screen.getmaxyx()
+    top = scroll_viewport(top, height, len(grid), y)
+    left = scroll_viewport(left, width // 2, len(grid[0]), x)
+
+    pad.noutrefresh(top, left * 2, 0, 0, min(height, len(grid) - top) - 1, min(width, (len(grid[0]) - left) * 2) - 1)
+    curses.doupdate()
+
+    return top, left
 
 def input_points(screen, grid):
     """
@@ -220,6 +354,29 @@ def input_move(screen):
     elif key == "KEY_RIGHT":
         return (+1, 0)
 
+def input_moves(screen):
+    """
+    Inputs all the moves typed by the user since the last call, waiting for at least one.
+    Returns the list of the deltas in x and y of the moves, in the order they were typed.
+    When an arrow key is held down, all the repeated keys are read at once, so the maze is only drawn again once for all of them.
+    """
+
+    moves = [input_move(screen)]
+
+    keys = {curses.KEY_UP: (0, -1), curses.KEY_DOWN: (0, +1), curses.KEY_LEFT: (-1, 0), curses.KEY_RIGHT: (+1, 0)}
+
+    screen.nodelay(True)
+    try:
+        key = screen.getch()
+        while key != -1:
+            if key in keys:
+                moves.append(keys[key])
+            key = screen.getch()
+    finally:
+        screen.nodelay(False)
+
+    return moves
+
 def get_path(grid, distances, x, y):
     """
     Traces back the path from the specified coordinates to the point of distance 0.
@@ -245,30 +402,20 @@ def get_path(grid, distances, x, y):
 
     return solution
 
-def rollback(distances, x, y, n):
+def rollback(distances, path, n):
     """
-    Traces back the path from the specified coordinates to the point of distance n.
-    Returns the grid specified, with -1 along the path.
-    WARNING: The distances should only describe one path of decrementing integers from the specified coordinates.
-             Otherwise, the behavior is undefined and the function may return None.
+    Undoes the moves of the specified path after the point of distance n, by removing them from the path and resetting their distance to -1.
+    The path and the distances are modified in place, and only the removed cells are visited.
+    Returns the list of the removed coordinates.
     """
 
-    distances = [line.copy() for line in distances]
+    removed = []
+    while len(path) > n + 1:
+        x, y = path.pop()
+        distances[y][x] = -1
+        removed.append((x, y))
 
-    d = distances[y][x]
-    distances[y][x] = -1
-
-    while d > n:
-        for cell in get_adjacent_cells(distances, x, y):
-            if distances[cell[1]][cell[0]] == d - 1:
-                x, y = cell
-                distances[y][x] = -1
-                d -= 1
-                break
-        else:
-            return None
-
-    return distances
+    return removed
 
 def player_solve_maze(screen, grid, xA, yA, xB, yB):
     """
@@ -279,34 +426,51 @@ def player_solve_maze(screen, grid, xA, yA, xB, yB):
     """
 
     distances = [[-1] * len(line) for line in grid]
-
     distances[yA][xA] = 0
-    x, y, d, found, explored = xA, yA, 1, False, 0
-    while not found:
-        solution = get_path(grid, distances, x, y)
-        if solution is not None:
-            solution[y][x] = "X"
-            screen.clear()
-            display_maze(screen, solution)
 
-        dx, dy = input_move(screen)
-        if y + dy < 0 or y + dy >= len(grid) or x + dx < 0 or x + dx >= len(grid[y + dy]) or grid[y + dy][x + dx] == -1:
-            continue
+    # The path of the user is kept as a stack of coordinates, and drawn on a copy of the grid which is updated at each move.
+    path, solution = [(xA, yA)], [line.copy() for line in grid]
 
-        if distances[y + dy][x + dx] != -1:
-            d = distances[y + dy][x + dx]
-            rollback(distances, x, y, d)
+    # The maze is only drawn once in a pad, then only the cells modified by each move are drawn again.
+    # Only the part of the pad around the user is displayed, and it scrolls to follow them.
+    solution[yA][xA] = "X"
+    pad = draw_maze(solution)
 
-        x, y = x + dx, y + dy
-        distances[y][x] = d
-        explored += 1
-        d += 1
+    screen.clear()
+    screen.noutrefresh()
+    top, left = display_viewport(screen, pad, solution, xA, yA, 0, 0)
+
+    x, y, explored = xA, yA, 0
+    while x != xB or y != yB:
+        # All the pending moves are applied before the maze is drawn again, so the display never lags behind the keyboard.
+        changed = []
+        for dx, dy in input_moves(screen):
+            if x == xB and y == yB:
+                break
+            if y + dy < 0 or y + dy >= len(grid) or x + dx < 0 or x + dx >= len(grid[y + dy]) or grid[y + dy][x + dx] == -1:
+                continue
 
-        if x == xB and y == yB:
-            found = True
+            changed += [(x, y), (x + dx, y + dy)]
+            if distances[y + dy][x + dx] != -1:
+                for px, py in rollback(distances, path, distances[y + dy][x + dx]):
+                    solution[py][px] = grid[py][px]
+                    changed.append((px, py))
+            else:
+                solution[y][x] = "." if grid[y][x] == " " else grid[y][x]
+                path.append((x + dx, y + dy))
+                distances[y + dy][x + dx] = len(path) - 1
+
+            x, y = x + dx, y + dy
+            solution[y][x] = "X"
+            explored += 1
+
+        draw_cells(pad, solution, changed)
+        top, left = display_viewport(screen, pad, solution, x, y, top, left)
+
+    solution[yB][xB] = grid[yB][xB]
 
     screen.clear()
-    return explored, distances[yB][xB], get_path(grid, distances, xB, yB)
+    return explored, len(path) - 1, solution
 
 def computer_solve_maze(grid, xA, yA, xB, yB):
     """
@@ -332,6 +496,565 @@ def computer_solve_maze(grid, xA, yA, xB, yB):
 
     return explored, distances[yB][xB], get_path(grid, distances, xB, yB)
 
+class DistanceField:
+    """
+    Distances of all the cells of a maze grid to a single source cell, usually the exit.
+    They are computed once by exploring the whole maze, and can then be used to find the shortest path from any cell.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    def __init__(self, grid, x, y):
+        self.grid = grid
+        self.distances = [[-1] * len(line) for line in grid]
+        self.distances[y][x] = 0
+
+        self.explored = 1
+        pending = collections.deque([(x, y)])
+        while pending:
+            x, y = pending.popleft()
+            d = self.distances[y][x] + 1
+
+            for cell in get_adjacent_cells(grid, x, y):
+                if self.distances[cell[1]][cell[0]] == -1:
+                    self.distances[cell[1]][cell[0]] = d
+                    self.explored += 1
+                    pending.append(cell)
+
+    def distance_to_exit(self, x, y):
+        """
+        Returns the length of the shortest path from the specified coordinates to the source, or -1 if it cannot be reached.
+        """
+
+        return self.distances[y][x]
+
+    def next_step(self, x, y):
+        """
+        Returns the coordinates of an adjacent cell one step closer to the source, or None if there is none.
+        """
+
+        d = self.distances[y][x]
+        if d <= 0:
+            return None
+
+        for cell in get_adjacent_cells(self.distances, x, y):
+            if self.distances[cell[1]][cell[0]] == d - 1:
+                return cell
+
+        return None
+
+    def get_path(self, x, y):
+        """
+        Returns the list of coordinates along the shortest path from the specified coordinates to the source, both included.
+        Returns None if the source cannot be reached.
+        """
+
+        if self.distances[y][x] == -1:
+            return None
+
+        path = [(x, y)]
+        while self.distances[y][x] > 0:
+            x, y = self.next_step(x, y)
+            path.append((x, y))
+
+        return path
+
+    def get_solution(self, x, y):
+        """
+        Returns the grid of the field, replacing spaces (" ") with dots (".") along the shortest path from the specified coordinates to the source.
+        Returns None if the source cannot be reached.
+        """
+
+        path = self.get_path(x, y)
+        if path is None:
+            return None
+
+        solution = [line.copy() for line in self.grid]
+        for x, y in path:
+            if solution[y][x] == " ":
+                solution[y][x] = "."
+
+        return solution
+
+def distance_field(grid, x, y):
+    """
+    Computes the distances of all the cells of the specified maze grid to the cell at the specified coordinates.
+    Returns a DistanceField, which can be shared to answer any number of queries on this maze without exploring it again.
+    """
+
+    return DistanceField(grid, x, y)
+
+def wavefront_distances(grid, xA, yA):
+    """
+    Computes the distance to the starting point (xA, yA) of every cell of the specified maze grid.
+    Instead of visiting the cells one by one, the whole frontier of the exploration is expanded at each step using NumPy arrays.
+    Returns a two-dimensional list of integers of the same dimensions as the grid, where -1 represents walls and unreachable cells.
+    Assumes -1 represents walls and anything else represents open cells.
+    WARNING: This function requires NumPy to be installed.
+    """
+
+    height, width = len(grid), len(grid[0])
+    stride = width + 2
+
+    # The grid is surrounded by an additional layer of walls, so that the neighbors of any cell are always at the same offsets.
+    passable = numpy.zeros((height + 2) * stride, dtype=bool)
+    passable.reshape(height + 2, stride)[1:-1, 1:-1] = [[cell != -1 for cell in line] for line in grid]
+    distances = numpy.full(passable.shape, -1, dtype=numpy.int64)
+    offsets = numpy.array([-1, +1, -stride, +stride])
+
+    frontier = numpy.array([(yA + 1) * stride + xA + 1])
+    passable[frontier] = False
+    distances[frontier] = 0
+
+    d = 0
+    while frontier.size:
+        d += 1
+        frontier = (frontier[:, None] + offsets).ravel()
+        frontier = numpy.unique(frontier[passable[frontier]])
+        passable[frontier] = False
+        distances[frontier] = d
+
+    return distances.reshape(height + 2, stride)[1:-1, 1:-1].tolist()
+
+def wavefront_solve_maze(grid, xA, yA, xB, yB):
+    """
+    Finds the optimal solution of the specified maze grid, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    Returns the number of cells explored by the algorithm, the length of the shortest path, as well as the path itself.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grid contains dots (".") along the path.
+    Behaves exactly like computer_solve_maze, which is used instead if NumPy is not installed.
+    """
+
+    if numpy is None:
+        return computer_solve_maze(grid, xA, yA, xB, yB)
+
+    distances = wavefront_distances(grid, xA, yA)
+    explored = sum(len(line) - line.count(-1) for line in distances)
+
+    return explored, distances[yB][xB], get_path(grid, distances, xB, yB)
+
+def get_open_rows(grid):
+    """
+    Returns a list of integers, one for each line of the specified grid, used as bit sets.
+    The bit x of each integer is set if and only if the cell on column x of the corresponding line is open.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    return [int("".join("0" if cell == -1 else "1" for cell in reversed(line)), 2) for line in grid]
+
+def expand_frontier(unvisited, frontier):
+    """
+    Performs one step of a breadth-first search where each line of the grid is represented as a bit set.
+    The frontier is a dictionary from line indexes to the bit set of the cells reached at the previous step on this line.
+    Returns the frontier of the next step, and removes its cells from the bit sets of unvisited open cells.
+    """
+
+    reached = {}
+    for y, bits in frontier.items():
+        reached[y] = reached.get(y, 0) | bits << 1 | bits >> 1
+        if y > 0:
+            reached[y - 1] = reached.get(y - 1, 0) | bits
+        if y + 1 < len(unvisited):
+            reached[y + 1] = reached.get(y + 1, 0) | bits
+
+    expanded = {}
+    for y, bits in reached.items():
+        bits &= unvisited[y]
+        if bits:
+            unvisited[y] ^= bits
+            expanded[y] = bits
+
+    return expanded
+
+def bitset_distances(grid, xA, yA):
+    """
+    Computes the distance to the starting point (xA, yA) of every cell of the specified maze grid.
+    Each step of the exploration only performs a few shifts, ORs and ANDs per line, using integers as bit sets.
+    Returns a two-dimensional list of integers of the same dimensions as the grid, where -1 represents walls and unreachable cells.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    unvisited = get_open_rows(grid)
+    distances = [[-1] * len(line) for line in grid]
+
+    unvisited[yA] &= ~(1 << xA)
+    distances[yA][xA] = 0
+
+    d, frontier = 0, {yA: 1 << xA}
+    while frontier:
+        d += 1
+        frontier = expand_frontier(unvisited, frontier)
+
+        for y, bits in frontier.items():
+            line = distances[y]
+            while bits:
+                low = bits & -bits
+                line[low.bit_length() - 1] = d
+                bits ^= low
+
+    return distances
+
+def bitset_is_reachable(grid, xA, yA, xB, yB):
+    """
+    Returns True if and only if the exit (xB, yB) can be reached from the starting point (xA, yA) in the specified maze grid.
+    Like labyrinth3_2.solve_maze, the exploration stops as soon as the exit is found.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    unvisited = get_open_rows(grid)
+    unvisited[yA] &= ~(1 << xA)
+
+    frontier = {yA: 1 << xA}
+    while frontier:
+        frontier = expand_frontier(unvisited, frontier)
+        if frontier.get(yB, 0) >> xB & 1:
+            return True
+
+    return xA == xB and yA == yB
+
+def bitset_solve_maze(grid, xA, yA, xB, yB):
+    """
+    Finds the optimal solution of the specified maze grid, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    Returns the number of cells explored by the algorithm, the length of the shortest path, as well as the path itself.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grid contains dots (".") along the path, or is None if the exit cannot be reached.
+    Like labyrinth3_2.solve_maze, the exploration stops as soon as the exit is found.
+    Only the frontier of each step is kept, as bit sets, and the path is traced back through them without computing the distance of every cell.
+    """
+
+    rows = get_open_rows(grid)
+    unvisited = rows.copy()
+    unvisited[yA] &= ~(1 << xA)
+
+    layers = [{yA: 1 << xA}]
+    while layers[-1] and not layers[-1].get(yB, 0) >> xB & 1:
+        layers.append(expand_frontier(unvisited, layers[-1]))
+
+    # The explored cells are the open cells which aren't unvisited anymore.
+    explored = sum(bin(row ^ remaining).count("1") for row, remaining in zip(rows, unvisited))
+    if not layers[-1]:
+        return explored, -1, None
+
+    solution = [line.copy() for line in grid]
+
+    x, y = xB, yB
+    for layer in reversed(layers[:-1]):
+        for dx, dy in [(-1, 0), (+1, 0), (0, -1), (0, +1)]:
+            if x + dx >= 0 and layer.get(y + dy, 0) >> (x + dx) & 1:
+                x, y = x + dx, y + dy
+                break
+
+        if solution[y][x] == " ":
+            solution[y][x] = "."
+
+    return explored, len(layers) - 1, solution
+
+def multi_source_solve_maze(grid, sources, targets):
+    """
+    Finds the nearest source of each target in the specified maze grid, as well as the shortest path between them, exploring the maze only once.
+    Sources and targets are lists of coordinates (x, y), such as spawn points and exits.
+    Returns the number of cells explored by the algorithm, as well as a list with a tuple for each target.
+    Each tuple contains the coordinates of the nearest source, the length of the shortest path, as well as the path itself.
+    If no source can reach a target, its tuple is (None, -1, None).
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grids contain dots (".") along the path.
+    """
+
+    distances = [[-1] * len(line) for line in grid]
+    owners = [[-1] * len(line) for line in grid]
+
+    pending = collections.deque()
+    for i, (x, y) in enumerate(sources):
+        if distances[y][x] == -1:
+            distances[y][x], owners[y][x] = 0, i
+            pending.append((x, y))
+
+    # The exploration can stop as soon as all the targets are reached, as the cells are explored by increasing distance.
+    remaining = set(targets) - set(sources)
+    explored = len(pending)
+    while pending and remaining:
+        x, y = pending.popleft()
+        for cell in get_adjacent_cells(grid, x, y):
+            if distances[cell[1]][cell[0]] == -1:
+                distances[cell[1]][cell[0]] = distances[y][x] + 1
+                owners[cell[1]][cell[0]] = owners[y][x]
+                explored += 1
+                remaining.discard(cell)
+                pending.append(cell)
+
+    results = []
+    for x, y in targets:
+        if distances[y][x] == -1:
+            results.append((None, -1, None))
+            continue
+
+        owner, length = owners[y][x], distances[y][x]
+        solution = [line.copy() for line in grid]
+
+        # Only the cells explored from the same source are followed, so that the path ends at this source.
+        d = length
+        while d > 0:
+            for cell in get_adjacent_cells(grid, x, y):
+                if distances[cell[1]][cell[0]] == d - 1 and owners[cell[1]][cell[0]] == owner:
+                    x, y = cell
+                    d -= 1
+                    break
+
+            if solution[y][x] == " ":
+                solution[y][x] = "."
+
+        results.append((sources[owner], length, solution))
+
+    return explored, results
+
+def is_open(grid, x, y):
+    """
+    Returns True if and only if the specified coordinates are inside the grid and represent an open cell.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    return y >= 0 and y < len(grid) and x >= 0 and x < len(grid[y]) and grid[y][x] != -1
+
+def jump(grid, x, y, dx, dy, xB, yB):
+    """
+    Moves from the specified coordinates in the direction (dx, dy) until reaching a jump point, and returns its coordinates.
+    Returns None if a wall is reached before any jump point.
+    Horizontal moves stop next to a forced neighbor, which is an open cell above or below that could not be reached by moving vertically first.
+    Vertical moves stop as soon as a horizontal move from the current cell would reach a jump point.
+    """
+
+    while True:
+        x, y = x + dx, y + dy
+        if not is_open(grid, x, y):
+            return None
+
+        if x == xB and y == yB:
+            return x, y
+
+        if dy == 0:
+            for p in [-1, +1]:
+                if is_open(grid, x, y + p) and not is_open(grid, x - dx, y + p):
+                    return x, y
+        elif jump(grid, x, y, -1, 0, xB, yB) is not None or jump(grid, x, y, +1, 0, xB, yB) is not None:
+            return x, y
+
+def get_jump_directions(grid, x, y, dx, dy):
+    """
+    Returns the directions worth exploring from the jump point at the specified coordinates, reached by moving in the direction (dx, dy).
+    All other directions lead to cells which can be reached by a path at least as short without going through this jump point.
+    """
+
+    if dx == 0 and dy == 0:
+        return [(-1, 0), (+1, 0), (0, -1), (0, +1)]
+
+    if dy != 0:
+        return [(0, dy), (-1, 0), (+1, 0)]
+
+    directions = [(dx, 0)]
+    for p in [-1, +1]:
+        if is_open(grid, x, y + p) and not is_open(grid, x - dx, y + p):
+            directions.append((0, p))
+
+    return directions
+
+def jps_solve_maze(grid, xA, yA, xB, yB):
+    """
+    Finds the optimal solution of the specified maze grid using jump point search, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    Returns the number of jump points explored by the algorithm, the length of the shortest path, as well as the path itself.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grid contains dots (".") along the path, or is None if the exit cannot be reached.
+    """
+
+    distances = {(xA, yA): 0}
+    parents = {(xA, yA): None}
+
+    explored = 0
+    pending = [(abs(xB - xA) + abs(yB - yA), 0, xA, yA)]
+    while pending:
+        _, d, x, y = heapq.heappop(pending)
+        if d > distances[(x, y)]:
+            continue
+        explored += 1
+
+        if x == xB and y == yB:
+            break
+
+        dx, dy = 0, 0
+        if parents[(x, y)] is not None:
+            px, py = parents[(x, y)]
+            dx, dy = (x > px) - (x < px), (y > py) - (y < py)
+
+        for dx, dy in get_jump_directions(grid, x, y, dx, dy):
+            point = jump(grid, x, y, dx, dy, xB, yB)
+            if point is None:
+                continue
+
+            nd = d + abs(point[0] - x) + abs(point[1] - y)
+            if point not in distances or nd < distances[point]:
+                distances[point] = nd
+                parents[point] = (x, y)
+                heapq.heappush(pending, (nd + abs(xB - point[0]) + abs(yB - point[1]), nd, point[0], point[1]))
+
+    if (xB, yB) not in distances:
+        return explored, -1, None
+
+    solution = [line.copy() for line in grid]
+
+    x, y = xB, yB
+    while parents[(x, y)] is not None:
+        px, py = parents[(x, y)]
+        while (x, y) != (px, py):
+            x, y = x + (px > x) - (px < x), y + (py > y) - (py < y)
+            if solution[y][x] == " ":
+                solution[y][x] = "."
+
+    return explored, distances[(xB, yB)], solution
+
+def generate_terrain(grid, amount, maximum):
+    """
+    Replaces the specified amount of random open cells of the specified maze grid with integers from 2 to the specified maximum.
+    These integers represent the cost to walk into the cell, such as mud, while spaces (" ") and letters cost 1.
+    Returns the new grid, which is a two-dimensional list of the same dimensions.
+    """
+
+    cells = [(x, y) for y, line in enumerate(grid) for x, cell in enumerate(line) if cell == " "]
+    for x, y in random.sample(cells, min(amount, len(cells))):
+        grid[y][x] = random.randint(2, maximum)
+
+    return grid
+
+def get_weight(cell):
+    """
+    Returns the cost to walk into the specified cell, which is its value for integers and 1 for any other open cell.
+    """
+
+    return cell if type(cell) is int else 1
+
+def get_weighted_path(grid, distances, x, y):
+    """
+    Traces back the path from the specified coordinates to the point of distance 0, taking the cost of each cell into account.
+    Returns the grid specified, replacing spaces (" ") with dots (".") along the path.
+    WARNING: The distances should be those computed by dijkstra_solve_maze for the same grid.
+             Otherwise, the behavior is undefined and the function may return None.
+    """
+
+    solution = [line.copy() for line in grid]
+
+    d = distances[y][x]
+    while d > 0:
+        d -= get_weight(grid[y][x])
+        for cell in get_adjacent_cells(grid, x, y):
+            if distances[cell[1]][cell[0]] == d:
+                x, y = cell
+                break
+        else:
+            return None
+
+        if solution[y][x] == " ":
+            solution[y][x] = "."
+
+    return solution
+
+def dijkstra_solve_maze(grid, xA, yA, xB, yB):
+    """
+    Finds the cheapest solution of the specified maze grid, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    Walking into a cell costs its weight, as returned by get_weight.
+    Returns the number of cells explored by the algorithm, the cost of the cheapest path, as well as the path itself.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grid contains dots (".") along the path, or is None if the exit cannot be reached.
+    """
+
+    maximum = max(max((get_weight(cell) for cell in line if cell != -1), default=1) for line in grid)
+    distances = [[-1] * len(line) for line in grid]
+
+    # As weights are small integers, pending cells are stored in one bucket per distance.
+    # Only the distances up to the current one plus the maximum weight can be pending, so the buckets are reused circularly.
+    buckets = [[] for _ in range(maximum + 1)]
+    buckets[0].append((xA, yA))
+    distances[yA][xA] = 0
+
+    explored, d, pending = 0, 0, 1
+    while pending:
+        bucket = buckets[d % len(buckets)]
+        while bucket:
+            x, y = bucket.pop()
+            pending -= 1
+            if distances[y][x] != d:
+                continue
+            explored += 1
+
+            if x == xB and y == yB:
+                return explored, d, get_weighted_path(grid, distances, xB, yB)
+
+            for cell in get_adjacent_cells(grid, x, y):
+                nd = d + get_weight(grid[cell[1]][cell[0]])
+                if distances[cell[1]][cell[0]] == -1 or nd < distances[cell[1]][cell[0]]:
+                    distances[cell[1]][cell[0]] = nd
+                    buckets[nd % len(buckets)].append(cell)
+                    pending += 1
+        d += 1
+
+    return explored, -1, None
+
+def start_solving(grid, xA, yA, xB, yB):
+    """
+    Starts finding the optimal solution of the specified maze grid in a background thread, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    Returns a future of the distance field to the exit, so the user can start playing right away and the solution is only waited for when it is needed.
+    """
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(distance_field, grid, xB, yB)
+    executor.shutdown(wait=False)
+
+    return future
+
+def draw_progress(screen, y, fraction):
+    """
+    Draws a progress bar of the specified fraction on the line y of the screen.
+    """
+
+    _, width = screen.getmaxyx()
+    length = max(min(width - 40, 50), 10)
+    filled = int(fraction * length)
+
+    screen.addstr(y, 0, "Generating: [" + "#" * filled + " " * (length - filled) + "] {:3d}% (q to cancel)".format(int(fraction * 100)))
+    screen.clrtoeol()
+
+def generate_maze_in_background(screen, width, height):
+    """
+    Generates a maze of the specified size in a background thread, while displaying a progress bar so that the screen never freezes.
+    The user can press q to cancel the generation, in which case None is returned.
+    -1 represents walls, spaces (" ") represent open cells.
+    """
+
+    fraction, cancel = 0, threading.Event()
+
+    def progress_callback(value):
+        nonlocal fraction
+        fraction = value
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(generate_maze, width, height, progress_callback, cancel)
+    executor.shutdown(wait=False)
+
+    y, _ = screen.getyx()
+    screen.timeout(PROGRESS_DELAY)
+    try:
+        while not future.done():
+            draw_progress(screen, y, fraction)
+            if screen.getch() in [ord("q"), ord("Q")]:
+                cancel.set()
+    except BaseException:
+        # The background thread is waited for when the program exits, so it must also stop if the user interrupts the program.
+        cancel.set()
+        raise
+    finally:
+        screen.timeout(-1)
+
+    screen.move(y, 0)
+    screen.clrtoeol()
+
+    return future.result()
+
 def input_maze(screen):
     """
     Inputs the required information from the user to generate a maze.
@@ -340,8 +1063,12 @@ def input_maze(screen):
     The entrance and exit are marked with "A" and "B" respectively.
     """
 
-    width, height = input_maze_size(screen)
-    grid = generate_maze(width, height)
+    grid = None
+    while grid is None:
+        width, height = input_maze_size(screen)
+        grid = generate_maze_in_background(screen, width, height)
+        if grid is None:
+            screen.addstr("The generation of the labyrinth was cancelled.\n\r")
 
     screen.addstr("Here is the random labyrinth:\n\r")
     display_maze(screen, grid)
@@ -353,10 +1080,11 @@ def input_maze(screen):
 
     return grid, xA, yA, xB, yB
 
-def play(screen, grid, xA, yA, xB, yB):
+def play(screen, grid, xA, yA, xB, yB, future):
     """
     Asks the user if he wishes to solve the maze himself or to find the solution automatically.
     Then, performs as requested using the specified information, and outputs some statistics.
+    The future returned by start_solving is only waited for once the statistics are needed.
     """
 
     screen.addstr("Do you want to solve the maze (y) or want the computer to give you the solution (n)? ")
@@ -365,14 +1093,17 @@ def play(screen, grid, xA, yA, xB, yB):
     while key not in ["y", "Y", "n", "N"]:
         key = screen.getkey()
 
-    computer_explored, computer_length, computer_solution = computer_solve_maze(grid, xA, yA, xB, yB)
+    if key in ["y", "Y"]:
+        start = time.time()
+        explored, length, solution = player_solve_maze(screen, grid, xA, yA, xB, yB)
+        end = time.time()
+        elapsed = end - start
+
+    # The shortest path was searched in the background while the user was playing.
+    field = future.result()
+    computer_explored, computer_length, computer_solution = field.explored, field.distance_to_exit(xA, yA), field.get_solution(xA, yA)
     if computer_solution is not None:
         if key in ["y", "Y"]:
-            start = time.time()
-            explored, length, solution = player_solve_maze(screen, grid, xA, yA, xB, yB)
-            end = time.time()
-            elapsed = end - start
-
             score = computer_length / length * 2 ** -(elapsed / (len(grid) * len(grid[0]))) * 100
 
             screen.clear()
@@ -408,10 +1139,12 @@ def main(screen=None):
 
     curses.start_color()
     curses.use_default_colors()
+    screen.scrollok(True)
 
     grid, xA, yA, xB, yB = input_maze(screen)
+    future = start_solving(grid, xA, yA, xB, yB)
 
-    play(screen, grid, xA, yA, xB, yB)
+    play(screen, grid, xA, yA, xB, yB, future)
 
     screen.addstr("Press any key to quit.")
     screen.getkey()
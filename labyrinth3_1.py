@@ -5,8 +5,16 @@ import sys
 import time
 import random
 import curses
+import asyncio
 import pickle
 import traceback
+import concurrent.futures
+
+# Delay in seconds between two updates of the screen while the user is playing.
+FRAME_DELAY = 0.1
+
+# Delay in seconds between two automatic saves of the user's progress.
+AUTOSAVE_DELAY = 30
 
 def input_int(screen, prefix, validate):
     """
@@ -153,26 +161,51 @@ def generate_maze(width, height):
 
     return grid
 
+def get_character(cell):
+    """
+    Returns the character used to display the specified cell.
+    Cells with -1 are replaced with stars ("*").
+    Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    """
+
+    characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
+    if cell == -1:
+        return "*"
+    elif type(cell) is int:
+        return characters[min(cell, len(characters) - 1)]
+    else:
+        return cell
+
+def get_row(line):
+    """
+    Returns the string used to display the specified row of a maze.
+    Cells with -1 are replaced with stars ("*").
+    Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    """
+
+    return " ".join(get_character(cell) for cell in line)
+
 def display_maze(screen, grid):
     """
     Displays the specified maze.
     Cells with -1 are replaced with stars ("*").
     Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    The whole maze is written to the screen at once, one line per row.
     """
 
-    characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
-    for line in grid:
-        for cell in line:
-            if cell == -1:
-                screen.addstr("*")
-            elif type(cell) is int:
-                screen.addstr(characters[min(cell, len(characters) - 1)])
-            else:
-                screen.addstr(cell)
+    screen.addstr("".join(get_row(line) + "\n\r" for line in grid))
 
-            screen.addstr(" ")
+def draw_cells(screen, grid, cells):
+    """
+    Draws again only the specified cells of a maze displayed by display_maze at the top left corner of the screen.
+    The screen isn't refreshed, so that only the modified characters are sent to the terminal at the next update.
+    Cells outside of the screen are ignored.
+    """
 
-        screen.addstr("\n\r")
+    height, width = screen.getmaxyx()
+    for x, y in cells:
+        if y < height and x * 2 < width - 1:
+            screen.addch(y, x * 2, get_character(grid[y][x]))
 
 def input_points(screen, grid):
     """
@@ -222,6 +255,28 @@ def input_move(screen):
     elif key == "KEY_RIGHT":
         return (+1, 0)
 
+def input_pending_moves(screen):
+    """
+    Inputs all the moves typed by the user since the last call, without waiting for any.
+    Returns the list of the deltas in x and y of the moves, in the order they were typed.
+    """
+
+    keys = {curses.KEY_UP: (0, -1), curses.KEY_DOWN: (0, +1), curses.KEY_LEFT: (-1, 0), curses.KEY_RIGHT: (+1, 0)}
+
+    moves = []
+
+    screen.nodelay(True)
+    try:
+        key = screen.getch()
+        while key != -1:
+            if key in keys:
+                moves.append(keys[key])
+            key = screen.getch()
+    finally:
+        screen.nodelay(False)
+
+    return moves
+
 def get_path(grid, distances, x, y):
     """
     Traces back the path from the specified coordinates to the point of distance 0.
@@ -247,50 +302,44 @@ def get_path(grid, distances, x, y):
 
     return solution
 
-def rollback(distances, x, y, n):
+def rollback(distances, path, n):
+    """
+    Undoes the moves of the specified path after the point of distance n, by removing them from the path and resetting their distance to -1.
+    The path and the distances are modified in place, and only the removed cells are visited.
+    Returns the list of the removed coordinates.
+    """
+
+    removed = []
+    while len(path) > n + 1:
+        x, y = path.pop()
+        distances[y][x] = -1
+        removed.append((x, y))
+
+    return removed
+
+def get_path_stack(distances, x, y):
     """
-    Traces back the path from the specified coordinates to the point of distance n.
-    Returns the grid specified, with -1 along the path.
+    Traces back the path from the specified coordinates to the point of distance 0.
+    Returns the list of coordinates along the path, starting from the point of distance 0.
     WARNING: The distances should only describe one path of decrementing integers from the specified coordinates.
              Otherwise, the behavior is undefined and the function may return None.
     """
 
-    distances = [line.copy() for line in distances]
+    path = [(x, y)]
 
     d = distances[y][x]
-    distances[y][x] = -1
-
-    while d > n:
+    while d > 0:
         for cell in get_adjacent_cells(distances, x, y):
             if distances[cell[1]][cell[0]] == d - 1:
                 x, y = cell
-                distances[y][x] = -1
                 d -= 1
                 break
         else:
             return None
 
-    return distances
-
-def player_move(screen, distances, grid, x, y, d):
-    """
-    Inputs a move from the user and move the current position accordingly.
-    Returns the new distances grid, positions, and path length.
-    """
-
-    dx, dy = input_move(screen)
-    while y + dy < 0 or y + dy >= len(grid) or x + dx < 0 or x + dx >= len(grid[y + dy]) or grid[y + dy][x + dx] == -1:
-        dx, dy = input_move(screen)
-
-    if distances[y + dy][x + dx] != -1:
-        d = distances[y + dy][x + dx]
-        rollback(distances, x, y, d)
-
-    x, y = x + dx, y + dy
-    distances[y][x] = d
-    d += 1
+        path.append((x, y))
 
-    return distances, x, y, d
+    return path[::-1]
 
 def save_progress(grid, xA, yA, xB, yB, distances, x, y, explored, elapsed):
     """
@@ -335,38 +384,109 @@ def player_solve_maze(screen, grid, xA, yA, xB, yB, distances, x, y, explored, e
     Returns the number of moves the user needed to find the path, the length of the path found by the user, as well as the path itself.
     Assumes -1 represents walls and anything else represents open cells.
     The returned grid contains dots (".") along the path.
+    The game runs in an asyncio event loop, which applies the moves as soon as they are typed, displays the elapsed time at a fixed rate and saves the progress regularly.
     """
 
-    if distances is None:
-        distances = [[-1] * len(line) for line in grid]
-
     if x < 0 or y < 0:
         x, y = xA, yA
 
-    if distances[y][x] == -1:
+    if distances is None:
+        distances = [[-1] * len(line) for line in grid]
         distances[y][x] = 0
 
-    d = distances[y][x] + 1
+    # The path of the user is kept as a stack of coordinates, and drawn on a copy of the grid which is updated at each move.
+    # Only the distances along the path are kept, in case the saved ones contained other cells.
+    path = get_path_stack(distances, x, y)
+    distances = [[-1] * len(line) for line in grid]
+    solution = [line.copy() for line in grid]
+    for d, (px, py) in enumerate(path):
+        distances[py][px] = d
+        if solution[py][px] == " ":
+            solution[py][px] = "."
 
-    start = time.time()
-    try:
-        found = False
-        while not found:
-            solution = get_path(grid, distances, x, y)
-            solution[y][x] = "X"
-            screen.clear()
-            display_maze(screen, solution)
+    # The maze is only displayed once, then only the cells modified by the moves are drawn again at each frame.
+    solution[y][x] = "X"
+    screen.clear()
+    display_maze(screen, solution)
+
+    changed, start = [], time.time()
+
+    def read_callback(finished):
+        nonlocal x, y, explored
+
+        # The moves are applied as soon as the keys are typed, independently of the frames drawn.
+        for dx, dy in input_pending_moves(screen):
+            if x == xB and y == yB:
+                break
+            if y + dy < 0 or y + dy >= len(grid) or x + dx < 0 or x + dx >= len(grid[y + dy]) or grid[y + dy][x + dx] == -1:
+                continue
 
-            distances, x, y, d = player_move(screen, distances, grid, x, y, d)
+            changed.extend([(x, y), (x + dx, y + dy)])
+            if distances[y + dy][x + dx] != -1:
+                for px, py in rollback(distances, path, distances[y + dy][x + dx]):
+                    solution[py][px] = grid[py][px]
+                    changed.append((px, py))
+            else:
+                solution[y][x] = "." if grid[y][x] == " " else grid[y][x]
+                path.append((x + dx, y + dy))
+                distances[y + dy][x + dx] = len(path) - 1
+
+            x, y = x + dx, y + dy
+            solution[y][x] = "X"
             explored += 1
-            found = x == xB and y == yB
 
-        screen.clear()
-        return explored, distances[yB][xB], get_path(grid, distances, xB, yB), time.time() - start + elapsed
+        if x == xB and y == yB:
+            finished.set()
+
+    async def draw_frames():
+        while True:
+            draw_cells(screen, solution, changed)
+            changed.clear()
+
+            # The time is displayed below the maze, unless the maze fills the whole height of the screen.
+            height, width = screen.getmaxyx()
+            if len(grid) + 1 < height:
+                screen.addstr(len(grid) + 1, 0, "Time: {:.1f} seconds".format(time.time() - start + elapsed)[:width - 1])
+            screen.noutrefresh()
+            curses.doupdate()
+
+            await asyncio.sleep(FRAME_DELAY)
+
+    async def autosave():
+        while True:
+            await asyncio.sleep(AUTOSAVE_DELAY)
+            save_progress(grid, xA, yA, xB, yB, distances, x, y, explored, time.time() - start + elapsed)
+
+    async def run():
+        loop, finished = asyncio.get_running_loop(), asyncio.Event()
+
+        loop.add_reader(sys.stdin.fileno(), read_callback, finished)
+        tasks = [asyncio.create_task(draw_frames()), asyncio.create_task(autosave())]
+        try:
+            # The other tasks never end by themselves, so if one of them ends first, its exception is raised instead of being lost.
+            done, _ = await asyncio.wait([asyncio.create_task(finished.wait())] + tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            loop.remove_reader(sys.stdin.fileno())
+            for task in tasks:
+                task.cancel()
+
+    try:
+        asyncio.run(run())
     except KeyboardInterrupt as e:
         save_progress(grid, xA, yA, xB, yB, distances, x, y, explored, time.time() - start + elapsed)
         raise e
 
+    # The game is over, so an automatic save must not be resumed.
+    if os.path.exists("labyrinth.save"):
+        os.remove("labyrinth.save")
+
+    solution[yB][xB] = grid[yB][xB]
+
+    screen.clear()
+    return explored, len(path) - 1, solution, time.time() - start + elapsed
+
 def computer_solve_maze(grid, xA, yA, xB, yB):
     """
     Finds the optimal solution of the specified maze grid, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
@@ -391,6 +511,18 @@ def computer_solve_maze(grid, xA, yA, xB, yB):
 
     return explored, distances[yB][xB], get_path(grid, distances, xB, yB)
 
+def start_solving(grid, xA, yA, xB, yB):
+    """
+    Starts finding the optimal solution of the specified maze grid in a background thread, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    Returns a future of the result of computer_solve_maze, so the user can start playing right away and the solution is only waited for when it is needed.
+    """
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(computer_solve_maze, grid, xA, yA, xB, yB)
+    executor.shutdown(wait=False)
+
+    return future
+
 def input_maze(screen):
     """
     Inputs the required information from the user to generate a maze.
@@ -447,10 +579,11 @@ def register_scoreboard(explored, length, elapsed, computer_explored, computer_l
             file.write("timestamp, explored, length, elapsed, computer_explored, computer_length, score\n")
             file.write(", ".join(map(str, entry)) + "\n")
 
-def play(screen, grid, xA, yA, xB, yB, distances, x, y, explored, elapsed):
+def play(screen, grid, xA, yA, xB, yB, distances, x, y, explored, elapsed, future):
     """
     Asks the user if he wishes to solve the maze himself or to find the solution automatically.
     Then, performs as requested using the specified information, and outputs some statistics.
+    The future returned by start_solving is only waited for once the statistics are needed.
     """
 
     if distances is None:
@@ -461,20 +594,22 @@ def play(screen, grid, xA, yA, xB, yB, distances, x, y, explored, elapsed):
     else:
         key = "y"
 
-    computer_explored, computer_length, computer_solution = computer_solve_maze(grid, xA, yA, xB, yB)
+    if key in ["y", "Y"]:
+        explored, length, solution, elapsed = player_solve_maze(screen, grid, xA, yA, xB, yB, distances, x, y, explored, elapsed)
+
+    # The shortest path was searched in the background while the user was playing.
+    computer_explored, computer_length, computer_solution = future.result()
     if computer_solution is not None:
         if key in ["y", "Y"]:
-            explored, length, solution, elapsed = player_solve_maze(screen, grid, xA, yA, xB, yB, distances, x, y, explored, elapsed)
-
             score = computer_length / length * 2 ** -(elapsed / (len(grid) * len(grid[0]))) * 100
             register_scoreboard(explored, length, elapsed, computer_explored, computer_length, score)
 
             screen.clear()
             screen.addstr("Here was the shortest path:\n\r")
             display_maze(screen, computer_solution)
-            screen.addstr("Number of explored cells to find your path: {}\n\rLength of your path: {}\n\rTime to find your path: {0:.2f} seconds\n\r\n\r".format(explored, length, int(elapsed)))
+            screen.addstr("Number of explored cells to find your path: {}\n\rLength of your path: {}\n\rTime to find your path: {:.2f} seconds\n\r\n\r".format(explored, length, elapsed))
             screen.addstr("Number of explored cells to find the shortest path: {}\n\rLength of the shortest path: {}\n\r\n\r".format(computer_explored, computer_length))
-            screen.addstr("Score: {0:.2f} points\n\r".format(score))
+            screen.addstr("Score: {:.2f} points\n\r".format(score))
         else:
             screen.clear()
             screen.addstr("Here is the shortest path:\n\r")
@@ -506,8 +641,9 @@ def main(screen=None):
     grid, xA, yA, xB, yB, distances, x, y, explored, elapsed = load_progress()
     if grid is None:
         grid, xA, yA, xB, yB = input_maze(screen)
+    future = start_solving(grid, xA, yA, xB, yB)
 
-    play(screen, grid, xA, yA, xB, yB, distances, x, y, explored, elapsed)
+    play(screen, grid, xA, yA, xB, yB, distances, x, y, explored, elapsed, future)
 
     screen.addstr("Press any key to quit.")
     screen.getkey()
@@ -2,6 +2,10 @@
 
 import sys
 import random
+import shutil
+
+# Quadrant characters indexed by the walls of a block of 2 by 2 cells, with 1 for the top left, 2 for the top right, 4 for the bottom left and 8 for the bottom right.
+QUADRANTS = " ▘▝▀▖▌▞▛▗▚▐▜▄▙▟█"
 
 def input_maze_size():
     """
@@ -128,23 +132,88 @@ def generate_maze(width, height):
 
     return grid
 
-def display_maze(grid):
+def get_row(line):
     """
-    Displays the specified maze.
+    Returns the string used to display the specified row of a maze.
     Cells with -1 are replaced with stars ("*").
     Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
     """
 
     characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
-    for line in grid:
-        for cell in line:
-            if cell == -1:
-                print("*", end=" ")
-            else:
-                if type(cell) is int:
-                    cell = characters[min(cell, len(characters) - 1)]
-                print(cell, end=" ")
-        print()
+    row = []
+    for cell in line:
+        if cell == -1:
+            row.append("*")
+        elif type(cell) is int:
+            row.append(characters[min(cell, len(characters) - 1)])
+        else:
+            row.append(cell)
+
+    return " ".join(row)
+
+def get_compact_row(top, bottom):
+    """
+    Returns the string used to display the two specified rows of a maze.
+    Each character represents a block of 2 by 2 cells, and uses a Unicode quadrant character showing which of the four cells are walls.
+    Blocks containing cells other than walls and spaces (" ") are replaced with the character of one of those cells, "A", "B" and "X" first.
+    """
+
+    characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
+    if len(top) % 2:
+        top, bottom = top + [" "], bottom + [" "]
+
+    row = []
+    for x in range(0, len(top), 2):
+        block = (top[x], top[x + 1], bottom[x], bottom[x + 1])
+        marks = [cell for cell in block if cell != -1 and cell != " "]
+        if marks:
+            cell = next((cell for cell in marks if cell in ("A", "B", "X")), marks[0])
+            row.append(characters[min(cell, len(characters) - 1)] if type(cell) is int else cell)
+        else:
+            row.append(QUADRANTS[sum(1 << i for i, cell in enumerate(block) if cell == -1)])
+
+    return "".join(row)
+
+def get_rows(grid, rows=None, dirty=()):
+    """
+    Returns the list of the strings used to display each row of the specified maze, built by get_row.
+    If the list previously returned for a maze of the same size is specified, only the rows whose indexes are in dirty are built again, and the list is updated in place.
+    """
+
+    if rows is None:
+        return [get_row(line) for line in grid]
+
+    for y in dirty:
+        rows[y] = get_row(grid[y])
+
+    return rows
+
+def display_maze(grid, rows=None):
+    """
+    Displays the specified maze.
+    Cells with -1 are replaced with stars ("*").
+    Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    The whole maze is printed at once, one line per row.
+    If the rows returned by get_rows for this maze are specified, they are printed without converting any cell again.
+    If the maze is wider than the terminal, it is displayed by display_compact_maze instead.
+    """
+
+    if len(grid[0]) * 2 > shutil.get_terminal_size().columns:
+        display_compact_maze(grid)
+        return
+
+    if rows is None:
+        rows = get_rows(grid)
+
+    print("\n".join(rows))
+
+def display_compact_maze(grid):
+    """
+    Displays the specified maze using one character for each block of 2 by 2 cells, which takes 4 times less space than display_maze.
+    The whole maze is printed at once, one line per two rows.
+    """
+
+    print("\n".join(get_compact_row(grid[y], grid[y + 1] if y + 1 < len(grid) else [" "] * len(grid[y])) for y in range(0, len(grid), 2)))
 
 def input_points(grid):
     """
@@ -200,6 +269,56 @@ def get_path(grid, distances, x, y):
 
     return solution
 
+def tremaux_solve_maze(grid, xA, yA, xB, yB):
+    """
+    Finds a solution of the specified maze grid using Trémaux's algorithm, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    Returns the number of cells explored by the algorithm, the length of the path, as well as the path itself.
+    Every passage between two cells is marked when it is walked through, and is never walked through more than twice.
+    Thus, it always terminates even if the maze contains cycles or if the starting and ending points aren't along an external wall.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grid contains dots (".") along the path, or is None if the exit cannot be reached.
+    """
+
+    marks = [[0] * len(line) for line in grid]
+    directions = [(0, -1), (-1, 0), (0, +1), (+1, 0)]
+
+    explored = 1
+    path, headings = [(xA, yA)], [0]
+    while path and path[-1] != (xB, yB):
+        x, y = path[-1]
+
+        for turn in [3, 0, 1, 2]:
+            direction = (headings[-1] + turn) % 4
+            dx, dy = directions[direction]
+
+            if marks[y][x] >> direction & 1:
+                continue
+            if y + dy < 0 or y + dy >= len(grid) or x + dx < 0 or x + dx >= len(grid[y + dy]) or grid[y + dy][x + dx] == -1:
+                continue
+
+            marks[y][x] |= 1 << direction
+            marks[y + dy][x + dx] |= 1 << (direction + 2) % 4
+
+            if marks[y + dy][x + dx] == 1 << (direction + 2) % 4:
+                path.append((x + dx, y + dy))
+                headings.append(direction)
+                explored += 1
+            # Otherwise, the cell was already visited through another passage, so we walk back immediately.
+            break
+        else:
+            path.pop()
+            headings.pop()
+
+    if not path:
+        return explored, -1, None
+
+    solution = [line.copy() for line in grid]
+    for x, y in path:
+        if solution[y][x] == " ":
+            solution[y][x] = "."
+
+    return explored, len(path) - 1, solution
+
 def solve_maze(grid, xA, yA, xB, yB):
     """
     Finds the optimal solution of the specified maze grid, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
@@ -210,9 +329,14 @@ def solve_maze(grid, xA, yA, xB, yB):
 
     distances = [[-1] * len(line) for line in grid]
 
-    explored = 0
+    explored, steps, limit = 0, 0, 4 * sum(len(line) for line in grid)
     x, y, direction, distance = xA, yA, 0, 0
     while direction in [0, 1, 2, 3]:
+        # There are at most 4 states per cell, so after more steps than that the hand went back to a previous state and loops forever.
+        steps += 1
+        if steps > limit:
+            return tremaux_solve_maze(grid, xA, yA, xB, yB)
+
         if distances[y][x] != -1:
             if distances[y][x] <= distance:
                 distance = distances[y][x]
@@ -249,7 +373,8 @@ def main():
     grid = generate_maze(width, height)
 
     print("Here is the random labyrinth:")
-    display_maze(grid)
+    rows = get_rows(grid)
+    display_maze(grid, rows)
 
     xA, yA, xB, yB = input_points(grid)
 
@@ -260,7 +385,9 @@ def main():
 
     if solution is not None:
         print("Here is the shortest path:")
-        display_maze(solution)
+        # Only the rows of the endpoints and of the path changed since the labyrinth was displayed.
+        rows = get_rows(solution, rows, {yA, yB} | {y for y, line in enumerate(solution) if line != grid[y]})
+        display_maze(solution, rows)
         print("Number of explored cells to find the path:", explored)
         print("Length of the shortest path:", length)
     else:
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 
 import sys
+import time
+import heapq
 import random
 
+# Number of walls tried by generate_maze between two checks of its progress and cancellation.
+CHECK_INTERVAL = 1024
+
 def input_maze_size():
     """
     Inputs and returns two integers from the user.
@@ -48,20 +53,6 @@ def generate_grid(width, height, depth):
 
     return grid
 
-def is_maze_done(grid):
-    """
-    Returns True if and only if the specified grid only contains -1 and 0.
-    This means the randomized Kruskal's maze generation algorithm is completed.
-    """
-
-    for line in grid:
-        for column in line:
-            for cell in column:
-                if cell != -1 and cell != 0:
-                    return False
-
-    return True
-
 def get_adjacent_cells(grid, x, y, z):
     """
     Returns all the adjacent valid cells to the one with the specified coordinates.
@@ -106,16 +97,36 @@ def propagate(grid, x, y, z):
         if grid[cell[2]][cell[1]][cell[0]] > minimum:
             propagate(grid, cell[0], cell[1], cell[2])
 
-def generate_maze(width, height, depth):
+def is_cancelled(cancel, deadline):
+    """
+    Returns True if and only if the specified cancel event is set, or if the specified deadline, a time as returned by time.time(), is passed.
+    Both are optional and ignored if they are None.
+    """
+
+    return (cancel is not None and cancel.is_set()) or (deadline is not None and time.time() >= deadline)
+
+def generate_maze(width, height, depth, progress=None, cancel=None, deadline=None):
     """
     Generates a maze of the specified size using a derived and randomized form of Kruskal's maze generation algorithm.
     The grid returned is a two-dimensional list of integers.
     Its first dimension is of size the height specified and its second of size the width specified.
     -1 represents walls, spaces (" ") represent open cells.
+    The progress function, if specified, is called regularly with the fraction of the passages already opened.
+    The generation is stopped and None is returned shortly after the cancel event, if specified, is set, or after the deadline, if specified, is passed.
     """
 
     grid = generate_grid(width, height, depth)
-    while not is_maze_done(grid):
+
+    # Each passage opened merges two sets of cells, so the maze is done once width * height * depth - 1 passages are opened.
+    opened, total, tries = 0, width * height * depth - 1, 0
+    while opened < total:
+        tries += 1
+        if tries % CHECK_INTERVAL == 0:
+            if is_cancelled(cancel, deadline):
+                return None
+            if progress is not None:
+                progress(opened / total)
+
         orientation = random.randint(0, 2)
         if orientation == 0:
             # Vertical
@@ -136,6 +147,10 @@ def generate_maze(width, height, depth):
         if grid[z][y][x] != -1:
             continue
         propagate(grid, x, y, z)
+        opened += 1
+
+    if progress is not None:
+        progress(1)
 
     for z in range(1, depth * 2):
         for y in range(1, height * 2):
@@ -260,6 +275,184 @@ def solve_maze(grid, xA, yA, zA, xB, yB, zB):
 
     return explored, distances[zB][yB][xB], get_path(grid, distances, xB, yB, zB)
 
+def flatten_grid(grid):
+    """
+    Converts the specified three-dimensional maze grid to a flat list of booleans, where True represents open cells.
+    The grid is surrounded by an additional layer of walls, so that the six neighbors of any cell are always at the same offsets.
+    Returns this list, along with the size of a padded line and the size of a padded level.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    width, height = len(grid[0][0]) + 2, len(grid[0]) + 2
+
+    passable = [False] * (width * height)
+    for line in grid:
+        passable.extend([False] * width)
+        for column in line:
+            passable.append(False)
+            passable.extend(cell != -1 for cell in column)
+            passable.append(False)
+        passable.extend([False] * width)
+    passable.extend([False] * (width * height))
+
+    return passable, width, width * height
+
+def mark_flat_path(solution, parents, width, level, i):
+    """
+    Traces back the path from the specified flat index to the cell without parent, following the specified list of parents.
+    Replaces spaces (" ") with dots (".") along the path in the specified solution grid.
+    """
+
+    while True:
+        x, y, z = i % width - 1, i % level // width - 1, i // level - 1
+        if solution[z][y][x] == " ":
+            solution[z][y][x] = "."
+
+        if parents[i] == i:
+            break
+        i = parents[i]
+
+def early_solve_maze(grid, xA, yA, zA, xB, yB, zB):
+    """
+    Finds the optimal solution of the specified maze grid, where the starting point is (xA, yA, zA) and the exit has coordinates (xB, yB, zB).
+    Returns the number of cells explored by the algorithm, the length of the shortest path, as well as the path itself.
+    Unlike solve_maze, the exploration stops as soon as the exit is found.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grid contains dots (".") along the path, or is None if the exit cannot be reached.
+    """
+
+    passable, width, level = flatten_grid(grid)
+    offsets = [-1, +1, -width, +width, -level, +level]
+    start, end = (zA + 1) * level + (yA + 1) * width + xA + 1, (zB + 1) * level + (yB + 1) * width + xB + 1
+
+    parents = [-1] * len(passable)
+    parents[start] = start
+
+    explored, d, frontier = 1, 0, [start]
+    while frontier and parents[end] == -1:
+        d += 1
+        expanded = []
+        for i in frontier:
+            for offset in offsets:
+                n = i + offset
+                if passable[n] and parents[n] == -1:
+                    parents[n] = i
+                    expanded.append(n)
+        explored += len(expanded)
+        frontier = expanded
+
+    if parents[end] == -1:
+        return explored, -1, None
+
+    solution = [[column.copy() for column in line] for line in grid]
+    mark_flat_path(solution, parents, width, level, end)
+
+    return explored, d, solution
+
+def bidirectional_solve_maze(grid, xA, yA, zA, xB, yB, zB):
+    """
+    Finds the optimal solution of the specified maze grid, where the starting point is (xA, yA, zA) and the exit has coordinates (xB, yB, zB).
+    Returns the number of cells explored by the algorithm, the length of the shortest path, as well as the path itself.
+    The maze is explored from both points at the same time, always extending the smallest frontier, until both explorations meet.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grid contains dots (".") along the path, or is None if the exit cannot be reached.
+    """
+
+    passable, width, level = flatten_grid(grid)
+    offsets = [-1, +1, -width, +width, -level, +level]
+    start, end = (zA + 1) * level + (yA + 1) * width + xA + 1, (zB + 1) * level + (yB + 1) * width + xB + 1
+
+    forward, backward = [-1] * len(passable), [-1] * len(passable)
+    forwardDistances, backwardDistances = [-1] * len(passable), [-1] * len(passable)
+    forward[start], backward[end] = start, end
+    forwardDistances[start], backwardDistances[end] = 0, 0
+
+    explored, best, meeting = 1 if start == end else 2, None, None
+    if start == end:
+        best, meeting = 0, (start, end)
+
+    forwardFrontier, backwardFrontier = [start], [end]
+    while forwardFrontier and backwardFrontier and best is None:
+        # Each step extends a whole layer of one of the two explorations, so that the first meeting layer contains the shortest path.
+        if len(forwardFrontier) <= len(backwardFrontier):
+            frontier, parents, distances, others, otherDistances = forwardFrontier, forward, forwardDistances, backward, backwardDistances
+        else:
+            frontier, parents, distances, others, otherDistances = backwardFrontier, backward, backwardDistances, forward, forwardDistances
+
+        expanded = []
+        for i in frontier:
+            for offset in offsets:
+                n = i + offset
+                if not passable[n]:
+                    continue
+
+                if others[n] != -1 and (best is None or distances[i] + 1 + otherDistances[n] < best):
+                    best = distances[i] + 1 + otherDistances[n]
+                    meeting = (i, n) if parents is forward else (n, i)
+
+                if parents[n] == -1:
+                    parents[n] = i
+                    distances[n] = distances[i] + 1
+                    expanded.append(n)
+        explored += len(expanded)
+
+        if parents is forward:
+            forwardFrontier = expanded
+        else:
+            backwardFrontier = expanded
+
+    if best is None:
+        return explored, -1, None
+
+    solution = [[column.copy() for column in line] for line in grid]
+    mark_flat_path(solution, forward, width, level, meeting[0])
+    mark_flat_path(solution, backward, width, level, meeting[1])
+
+    return explored, best, solution
+
+def astar_solve_maze(grid, xA, yA, zA, xB, yB, zB):
+    """
+    Finds the optimal solution of the specified maze grid using the A* algorithm, where the starting point is (xA, yA, zA) and the exit has coordinates (xB, yB, zB).
+    Returns the number of cells explored by the algorithm, the length of the shortest path, as well as the path itself.
+    The cells closest to the exit according to the Manhattan distance are explored first, and the exploration stops as soon as the exit is found.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grid contains dots (".") along the path, or is None if the exit cannot be reached.
+    """
+
+    passable, width, level = flatten_grid(grid)
+    offsets = [-1, +1, -width, +width, -level, +level]
+    start, end = (zA + 1) * level + (yA + 1) * width + xA + 1, (zB + 1) * level + (yB + 1) * width + xB + 1
+
+    parents = [-1] * len(passable)
+    distances = [-1] * len(passable)
+    parents[start], distances[start] = start, 0
+
+    explored = 0
+    pending = [(abs(xB - xA) + abs(yB - yA) + abs(zB - zA), 0, start)]
+    while pending:
+        _, d, i = heapq.heappop(pending)
+        if d > distances[i]:
+            continue
+        explored += 1
+
+        if i == end:
+            break
+
+        for offset in offsets:
+            n = i + offset
+            if passable[n] and (distances[n] == -1 or distances[n] > d + 1):
+                parents[n], distances[n] = i, d + 1
+                x, y, z = n % width - 1, n % level // width - 1, n // level - 1
+                heapq.heappush(pending, (d + 1 + abs(xB - x) + abs(yB - y) + abs(zB - z), d + 1, n))
+
+    if distances[end] == -1:
+        return explored, -1, None
+
+    solution = [[column.copy() for column in line] for line in grid]
+    mark_flat_path(solution, parents, width, level, end)
+
+    return explored, distances[end], solution
+
 def main():
     """
     Executes the labyrinth program.
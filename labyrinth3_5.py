@@ -2,9 +2,14 @@
 
 import sys
 import time
+import heapq
 import random
 import curses
 import traceback
+import collections
+
+# Number of walls tried by generate_maze between two checks of its progress and cancellation.
+CHECK_INTERVAL = 1024
 
 def input_int(screen, prefix, validate):
     """
@@ -116,15 +121,24 @@ def propagate(grid, x, y):
         if grid[cell[1]][cell[0]] > minimum:
             propagate(grid, cell[0], cell[1])
 
-def generate_cycles(grid, cycles):
+def generate_cycles(grid, cycles, progress=None, cancel=None, deadline=None):
     """
     Adds at least the specified amount of cycles in the specified maze grid.
     Returns the new grid, which is a two-dimensional list of integers of same dimensions.
     Assumes -1 represents walls and anything else represents open cells.
+    The progress function, if specified, is called regularly with the fraction of the cycles already added.
+    The generation is stopped and None is returned shortly after the cancel event, if specified, is set, or after the deadline, if specified, is passed.
     """
 
-    i = 0
+    i, tries = 0, 0
     while i < cycles:
+        tries += 1
+        if tries % CHECK_INTERVAL == 0:
+            if is_cancelled(cancel, deadline):
+                return None
+            if progress is not None:
+                progress(i / cycles)
+
         if is_maze_done(grid, False):
             break
 
@@ -145,17 +159,36 @@ def generate_cycles(grid, cycles):
 
     return grid
 
-def generate_maze(width, height, cycles):
+def is_cancelled(cancel, deadline):
+    """
+    Returns True if and only if the specified cancel event is set, or if the specified deadline, a time as returned by time.time(), is passed.
+    Both are optional and ignored if they are None.
+    """
+
+    return (cancel is not None and cancel.is_set()) or (deadline is not None and time.time() >= deadline)
+
+def generate_maze(width, height, cycles, progress=None, cancel=None, deadline=None):
     """
     Generates a maze of the specified size using a derived and randomized form of Kruskal's maze generation algorithm.
     The grid returned is a two-dimensional list of integers.
     Its first dimension is of size the height specified and its second of size the width specified.
     -1 represents walls, spaces (" ") represent open cells.
+    The progress function, if specified, is called regularly with the fraction of the passages already opened, including the ones of the cycles.
+    The generation is stopped and None is returned shortly after the cancel event, if specified, is set, or after the deadline, if specified, is passed.
     """
 
     grid = generate_grid(width, height)
 
-    while not is_maze_done(grid, True):
+    # Each passage opened merges two sets of cells, so the maze is done once width * height - 1 passages are opened.
+    opened, total, tries = 0, width * height - 1, 0
+    while opened < total:
+        tries += 1
+        if tries % CHECK_INTERVAL == 0:
+            if is_cancelled(cancel, deadline):
+                return None
+            if progress is not None:
+                progress(opened / (total + cycles))
+
         if random.getrandbits(1):
             # Horizontal
             x = random.randrange(width) * 2 + 1
@@ -172,8 +205,18 @@ def generate_maze(width, height, cycles):
                 continue
 
         propagate(grid, x, y)
+        opened += 1
+
+    cycles_progress = None
+    if progress is not None:
+        cycles_progress = lambda fraction: progress((total + fraction * cycles) / (total + cycles))
 
-    grid = generate_cycles(grid, cycles)
+    grid = generate_cycles(grid, cycles, cycles_progress, cancel, deadline)
+    if grid is None:
+        return None
+
+    if progress is not None:
+        progress(1)
 
     for y in range(1, height * 2):
         for x in range(1, width * 2):
@@ -182,26 +225,51 @@ def generate_maze(width, height, cycles):
 
     return grid
 
+def get_character(cell):
+    """
+    Returns the character used to display the specified cell.
+    Cells with -1 are replaced with stars ("*").
+    Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    """
+
+    characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
+    if cell == -1:
+        return "*"
+    elif type(cell) is int:
+        return characters[min(cell, len(characters) - 1)]
+    else:
+        return cell
+
+def get_row(line):
+    """
+    Returns the string used to display the specified row of a maze.
+    Cells with -1 are replaced with stars ("*").
+    Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    """
+
+    return " ".join(get_character(cell) for cell in line)
+
 def display_maze(screen, grid):
     """
     Displays the specified maze.
     Cells with -1 are replaced with stars ("*").
     Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    The whole maze is written to the screen at once, one line per row.
     """
 
-    characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
-    for line in grid:
-        for cell in line:
-            if cell == -1:
-                screen.addstr("*")
-            elif type(cell) is int:
-                screen.addstr(characters[min(cell, len(characters) - 1)])
-            else:
-                screen.addstr(cell)
+    screen.addstr("".join(get_row(line) + "\n\r" for line in grid))
 
-            screen.addstr(" ")
+def draw_cells(screen, grid, cells):
+    """
+    Draws again only the specified cells of a maze displayed by display_maze at the top left corner of the screen.
+    The terminal is updated once, after all the cells are drawn, so that only the modified characters are sent to it.
+    """
+
+    for x, y in cells:
+        screen.addch(y, x * 2, get_character(grid[y][x]))
 
-        screen.addstr("\n\r")
+    screen.noutrefresh()
+    curses.doupdate()
 
 def input_points(screen, grid):
     """
@@ -276,30 +344,20 @@ def get_path(grid, distances, x, y):
 
     return solution
 
-def rollback(distances, x, y, n):
+def rollback(distances, path, n):
     """
-    Traces back the path from the specified coordinates to the point of distance n.
-    Returns the grid specified, with -1 along the path.
-    WARNING: The distances should only describe one path of decrementing integers from the specified coordinates.
-             Otherwise, the behavior is undefined and the function may return None.
+    Undoes the moves of the specified path after the point of distance n, by removing them from the path and resetting their distance to -1.
+    The path and the distances are modified in place, and only the removed cells are visited.
+    Returns the list of the removed coordinates.
     """
 
-    distances = [line.copy() for line in distances]
+    removed = []
+    while len(path) > n + 1:
+        x, y = path.pop()
+        distances[y][x] = -1
+        removed.append((x, y))
 
-    d = distances[y][x]
-    distances[y][x] = -1
-
-    while d > n:
-        for cell in get_adjacent_cells(distances, x, y):
-            if distances[cell[1]][cell[0]] == d - 1:
-                x, y = cell
-                distances[y][x] = -1
-                d -= 1
-                break
-        else:
-            return None
-
-    return distances
+    return removed
 
 def player_solve_maze(screen, grid, xA, yA, xB, yB):
     """
@@ -310,59 +368,304 @@ def player_solve_maze(screen, grid, xA, yA, xB, yB):
     """
 
     distances = [[-1] * len(line) for line in grid]
-
     distances[yA][xA] = 0
-    x, y, d, found, explored = xA, yA, 1, False, 0
-    while not found:
-        solution = get_path(grid, distances, x, y)
-        if solution is not None:
-            solution[y][x] = "X"
-            screen.clear()
-            display_maze(screen, solution)
 
+    # The path of the user is kept as a stack of coordinates, and drawn on a copy of the grid which is updated at each move.
+    path, solution = [(xA, yA)], [line.copy() for line in grid]
+
+    # The maze is only displayed once, then only the cells modified by each move are drawn again.
+    solution[yA][xA] = "X"
+    screen.clear()
+    display_maze(screen, solution)
+
+    x, y, explored = xA, yA, 0
+    while x != xB or y != yB:
         dx, dy = input_move(screen)
         if y + dy < 0 or y + dy >= len(grid) or x + dx < 0 or x + dx >= len(grid[y + dy]) or grid[y + dy][x + dx] == -1:
             continue
 
+        changed = [(x, y), (x + dx, y + dy)]
         if distances[y + dy][x + dx] != -1:
-            d = distances[y + dy][x + dx]
-            rollback(distances, x, y, d)
+            for px, py in rollback(distances, path, distances[y + dy][x + dx]):
+                solution[py][px] = grid[py][px]
+                changed.append((px, py))
+        else:
+            solution[y][x] = "." if grid[y][x] == " " else grid[y][x]
+            path.append((x + dx, y + dy))
+            distances[y + dy][x + dx] = len(path) - 1
 
         x, y = x + dx, y + dy
-        distances[y][x] = d
+        solution[y][x] = "X"
         explored += 1
-        d += 1
 
-        if x == xB and y == yB:
-            found = True
+        draw_cells(screen, solution, changed)
+
+    solution[yB][xB] = grid[yB][xB]
 
     screen.clear()
-    return explored, distances[yB][xB], get_path(grid, distances, xB, yB)
+    return explored, len(path) - 1, solution
 
-def computer_solve_maze(grid, xA, yA, xB, yB):
+def get_distances(grid, xA, yA):
     """
-    Finds the optimal solution of the specified maze grid, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
-    Returns the number of cells explored by the algorithm, the length of the shortest path, as well as the path itself.
+    Computes the distance to the starting point (xA, yA) of every cell of the specified maze grid.
+    Returns a two-dimensional list of integers of the same dimensions as the grid, where -1 represents walls and unreachable cells.
     Assumes -1 represents walls and anything else represents open cells.
-    The returned grid contains dots (".") along the path.
     """
 
     distances = [[-1] * len(line) for line in grid]
 
-    explored = 0
     pending = [(xA, yA, 0)]
     while pending:
         x, y, d = pending.pop(0)
         if distances[y][x] != -1 and distances[y][x] <= d:
             continue
         distances[y][x] = d
-        explored += 1
 
         for cell in get_adjacent_cells(grid, x, y):
             pending.append((cell[0], cell[1], d + 1))
 
+    return distances
+
+def open_wall(grid, distances, x, y):
+    """
+    Replaces the wall at the specified coordinates with an open cell, and updates the distances computed by get_distances accordingly.
+    Only the cells which get closer to the starting point are visited, the rest of the distances are left untouched.
+    Returns the number of cells whose distance changed.
+    """
+
+    if grid[y][x] != -1:
+        return 0
+
+    grid[y][x] = " "
+
+    pending = [(distances[cell[1]][cell[0]] + 1, x, y) for cell in get_adjacent_cells(grid, x, y) if distances[cell[1]][cell[0]] != -1]
+    return repair_distances(grid, distances, pending)
+
+def close_wall(grid, distances, x, y):
+    """
+    Replaces the open cell at the specified coordinates with a wall, and updates the distances computed by get_distances accordingly.
+    Only the cells whose every shortest path went through this cell are visited, the rest of the distances are left untouched.
+    Returns the number of cells whose distance changed.
+    """
+
+    if grid[y][x] == -1:
+        return 0
+
+    d = distances[y][x]
+    grid[y][x] = -1
+    distances[y][x] = -1
+
+    if d == -1:
+        return 0
+
+    # First, find all the cells which don't have any neighbor closer to the starting point anymore.
+    affected, pending = [(x, y)], [cell for cell in get_adjacent_cells(grid, x, y) if distances[cell[1]][cell[0]] == d + 1]
+    while pending:
+        cx, cy = pending.pop(0)
+        d = distances[cy][cx]
+        if d == -1:
+            continue
+
+        if any(distances[cell[1]][cell[0]] == d - 1 for cell in get_adjacent_cells(grid, cx, cy)):
+            continue
+
+        distances[cy][cx] = -1
+        affected.append((cx, cy))
+
+        for cell in get_adjacent_cells(grid, cx, cy):
+            if distances[cell[1]][cell[0]] == d + 1:
+                pending.append(cell)
+
+    # Then, compute their new distances from their unaffected neighbors.
+    pending = []
+    for cx, cy in affected[1:]:
+        for cell in get_adjacent_cells(grid, cx, cy):
+            if distances[cell[1]][cell[0]] != -1:
+                pending.append((distances[cell[1]][cell[0]] + 1, cx, cy))
+
+    return repair_distances(grid, distances, pending) + len(affected)
+
+def repair_distances(grid, distances, pending):
+    """
+    Propagates the specified candidate distances, given as a list of tuples (distance, x, y), to the distances computed by get_distances.
+    Cells are only updated when the candidate distance is shorter than the current one.
+    Returns the number of cells updated.
+    """
+
+    heapq.heapify(pending)
+
+    updated = 0
+    while pending:
+        d, x, y = heapq.heappop(pending)
+        if distances[y][x] != -1 and distances[y][x] <= d:
+            continue
+        distances[y][x] = d
+        updated += 1
+
+        for cell in get_adjacent_cells(grid, x, y):
+            if distances[cell[1]][cell[0]] == -1 or distances[cell[1]][cell[0]] > d + 1:
+                heapq.heappush(pending, (d + 1, cell[0], cell[1]))
+
+    return updated
+
+def computer_solve_maze(grid, xA, yA, xB, yB):
+    """
+    Finds the optimal solution of the specified maze grid, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    Returns the number of cells explored by the algorithm, the length of the shortest path, as well as the path itself.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grid contains dots (".") along the path.
+    """
+
+    distances = get_distances(grid, xA, yA)
+    explored = sum(len(line) - line.count(-1) for line in distances)
+
     return explored, distances[yB][xB], get_path(grid, distances, xB, yB)
 
+def count_shortest_paths(grid, xA, yA, xB, yB):
+    """
+    Returns the number of distinct shortest paths between the starting point (xA, yA) and the exit (xB, yB) of the specified maze grid.
+    The number of shortest paths to each cell is the sum of those of its neighbors one step closer to the starting point, so the maze is only explored once.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    distances = [[-1] * len(line) for line in grid]
+    counts = [[0] * len(line) for line in grid]
+    distances[yA][xA], counts[yA][xA] = 0, 1
+
+    pending = collections.deque([(xA, yA)])
+    while pending:
+        x, y = pending.popleft()
+        if distances[yB][xB] != -1 and distances[y][x] >= distances[yB][xB]:
+            break
+
+        for cell in get_adjacent_cells(grid, x, y):
+            if distances[cell[1]][cell[0]] == -1:
+                distances[cell[1]][cell[0]] = distances[y][x] + 1
+                pending.append(cell)
+
+            if distances[cell[1]][cell[0]] == distances[y][x] + 1:
+                counts[cell[1]][cell[0]] += counts[y][x]
+
+    return counts[yB][xB]
+
+def get_junction_graph(grid, points):
+    """
+    Contracts the specified maze grid into a graph whose nodes are the junctions, the dead ends and the specified points.
+    Returns a dictionary from each node to the list of its corridors, as tuples (node, length, key, cells).
+    The key identifies the corridor, and the cells are those between both nodes.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    nodes = set(points)
+    for y, line in enumerate(grid):
+        for x, cell in enumerate(line):
+            if cell != -1 and len(get_adjacent_cells(grid, x, y)) != 2:
+                nodes.add((x, y))
+
+    graph = {}
+    for node in nodes:
+        graph[node] = []
+        for first in get_adjacent_cells(grid, node[0], node[1]):
+            previous, current, cells = node, first, []
+            while current not in nodes:
+                cells.append(current)
+                previous, current = current, [cell for cell in get_adjacent_cells(grid, current[0], current[1]) if cell != previous][0]
+
+            if current != node:
+                # Both ends of a corridor describe it with the same key, made of the first cell seen from each end.
+                key = frozenset([(node, first), (current, previous)])
+                graph[node].append((current, len(cells) + 1, key, cells))
+
+    return graph
+
+def get_cheapest_path(graph, start, end, bannedNodes, bannedKeys):
+    """
+    Finds the shortest path from start to end in the specified junction graph, without using the banned nodes and corridors.
+    Returns a tuple containing its length, the list of its nodes and the list of its corridors, or None if there is none.
+    """
+
+    distances, parents = {start: 0}, {start: None}
+    pending = [(0, start)]
+    while pending:
+        d, node = heapq.heappop(pending)
+        if d > distances[node]:
+            continue
+
+        if node == end:
+            nodes, corridors = [end], []
+            while parents[nodes[-1]] is not None:
+                previous, corridor = parents[nodes[-1]]
+                nodes.append(previous)
+                corridors.append(corridor)
+            return d, nodes[::-1], corridors[::-1]
+
+        for corridor in graph[node]:
+            neighbor, length, key, cells = corridor
+            if neighbor in bannedNodes or key in bannedKeys:
+                continue
+
+            if neighbor not in distances or d + length < distances[neighbor]:
+                distances[neighbor] = d + length
+                parents[neighbor] = (node, corridor)
+                heapq.heappush(pending, (d + length, neighbor))
+
+    return None
+
+def k_shortest_paths(grid, xA, yA, xB, yB, k):
+    """
+    Finds the k shortest paths without loops between the starting point (xA, yA) and the exit (xB, yB) of the specified maze grid, using Yen's algorithm.
+    The algorithm runs on the graph of junctions, so that long corridors don't cost more than a single step.
+    Returns a list of at most k tuples, by increasing length, each containing the length of a path and the path itself.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grids contain dots (".") along the path.
+    """
+
+    start, end = (xA, yA), (xB, yB)
+    graph = get_junction_graph(grid, [start, end])
+
+    first = get_cheapest_path(graph, start, end, set(), set())
+    if first is None:
+        return []
+
+    paths, candidates, seen = [first], [], {tuple(corridor[2] for corridor in first[2])}
+    while len(paths) < k:
+        length, nodes, corridors = paths[-1]
+
+        for i in range(len(nodes) - 1):
+            rootLength = sum(corridor[1] for corridor in corridors[:i])
+            rootKeys = [corridor[2] for corridor in corridors[:i]]
+
+            # Forbid the corridors already used after the same root, as well as the nodes of the root, so that the new path has no loop.
+            bannedKeys = set()
+            for path in paths:
+                if [corridor[2] for corridor in path[2][:i]] == rootKeys and len(path[2]) > i:
+                    bannedKeys.add(path[2][i][2])
+
+            spur = get_cheapest_path(graph, nodes[i], end, set(nodes[:i]), bannedKeys)
+            if spur is None:
+                continue
+
+            path = (rootLength + spur[0], nodes[:i] + spur[1], corridors[:i] + spur[2])
+            keys = tuple(corridor[2] for corridor in path[2])
+            if keys not in seen:
+                seen.add(keys)
+                heapq.heappush(candidates, (path[0], len(seen), path))
+
+        if not candidates:
+            break
+
+        paths.append(heapq.heappop(candidates)[2])
+
+    results = []
+    for length, nodes, corridors in paths:
+        solution = [line.copy() for line in grid]
+        for x, y in nodes + [cell for corridor in corridors for cell in corridor[3]]:
+            if solution[y][x] == " ":
+                solution[y][x] = "."
+        results.append((length, solution))
+
+    return results
+
 def input_maze(screen):
     """
     Inputs the required information from the user to generate a maze.
@@ -2,6 +2,9 @@
 
 import sys
 import random
+import shutil
+
+QUADRANTS = " ▘▝▀▖▌▞▛▗▚▐▜▄▙▟█"
 
 def input_maze_size():
     print("Enter the size of your labyrinth:")
@@ -119,17 +122,57 @@ def generate_maze(width, height, cycles):
 
     return grid
 
-def display_maze(grid):
+def get_row(line):
+    characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
+    row = []
+    for cell in line:
+        if cell == -1:
+            row.append("*")
+        elif type(cell) is int:
+            row.append(characters[min(cell, len(characters) - 1)])
+        else:
+            row.append(cell)
+
+    return " ".join(row)
+
+def get_compact_row(top, bottom):
     characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
-    for line in grid:
-        for cell in line:
-            if cell == -1:
-                print("*", end=" ")
-            else:
-                if type(cell) is int:
-                    cell = characters[min(cell, len(characters) - 1)]
-                print(cell, end=" ")
-        print()
+    if len(top) % 2:
+        top, bottom = top + [" "], bottom + [" "]
+
+    row = []
+    for x in range(0, len(top), 2):
+        block = (top[x], top[x + 1], bottom[x], bottom[x + 1])
+        marks = [cell for cell in block if cell != -1 and cell != " "]
+        if marks:
+            cell = next((cell for cell in marks if cell in ("A", "B", "X")), marks[0])
+            row.append(characters[min(cell, len(characters) - 1)] if type(cell) is int else cell)
+        else:
+            row.append(QUADRANTS[sum(1 << i for i, cell in enumerate(block) if cell == -1)])
+
+    return "".join(row)
+
+def get_rows(grid, rows=None, dirty=()):
+    if rows is None:
+        return [get_row(line) for line in grid]
+
+    for y in dirty:
+        rows[y] = get_row(grid[y])
+
+    return rows
+
+def display_maze(grid, rows=None):
+    if len(grid[0]) * 2 > shutil.get_terminal_size().columns:
+        display_compact_maze(grid)
+        return
+
+    if rows is None:
+        rows = get_rows(grid)
+
+    print("\n".join(rows))
+
+def display_compact_maze(grid):
+    print("\n".join(get_compact_row(grid[y], grid[y + 1] if y + 1 < len(grid) else [" "] * len(grid[y])) for y in range(0, len(grid), 2)))
 
 def input_points(grid):
     valid = False
@@ -204,7 +247,8 @@ def main():
     grid = generate_maze(width, height, cycles)
 
     print("Here is the random labyrinth:")
-    display_maze(grid)
+    rows = get_rows(grid)
+    display_maze(grid, rows)
 
     xA, yA, xB, yB = input_points(grid)
 
@@ -215,7 +259,8 @@ def main():
 
     if solution is not None:
         print("Here is the shortest path:")
-        display_maze(solution)
+        rows = get_rows(solution, rows, {yA, yB} | {y for y, line in enumerate(solution) if line != grid[y]})
+        display_maze(solution, rows)
         print("Number of explored cells to find the path:", explored)
         print("Length of the shortest path:", length)
     else:
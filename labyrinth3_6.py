@@ -4,9 +4,30 @@ import sys
 import time
 import random
 import tkinter
+import threading
 import traceback
+import concurrent.futures
+from tkinter import ttk
 from tkinter import messagebox
 
+# Size in pixels of the side of each cell displayed.
+CELL_SIZE = 16
+
+# Number of walls tried by generate_maze between two checks of its progress and cancellation.
+CHECK_INTERVAL = 1024
+
+# Delay in milliseconds between two updates of the progress bar while a maze is generated.
+PROGRESS_DELAY = 100
+
+# Mazes with more cells than this are displayed as an image, with one pixel per cell before zooming.
+BITMAP_CELLS = 401 * 401
+
+# Largest size in pixels of the zoomed image of a maze, as zooming copies the whole image: 4096 by 4096 pixels already take 64 MB.
+BITMAP_SIZE = 4096
+
+# Colors of the cells in the image of a maze, open cells not listed here are white.
+COLORS = {-1: "#000000", "A": "#00c000", "B": "#c00000", ".": "#4080ff", "X": "#ff8000"}
+
 def input_maze_size(screen, callback):
     """
     Inputs and returns two integers from the user.
@@ -30,10 +51,10 @@ def input_maze_size(screen, callback):
     titleLabel = tkinter.Label(screen, text="Enter the size of your labyrinth:")
     titleLabel.grid(row=1, column=1, columnspan=2)
 
-    widthScale = tkinter.Scale(screen, from_=2, to=32, variable=widthValue, orient=tkinter.HORIZONTAL)
+    widthScale = tkinter.Scale(screen, from_=2, to=1000, length=300, variable=widthValue, orient=tkinter.HORIZONTAL)
     widthScale.set(16)
 
-    heightScale = tkinter.Scale(screen, from_=2, to=20, variable=heightValue, orient=tkinter.HORIZONTAL)
+    heightScale = tkinter.Scale(screen, from_=2, to=1000, length=300, variable=heightValue, orient=tkinter.HORIZONTAL)
     heightScale.set(10)
 
     widthLabel = tkinter.Label(screen, text="Width: ")
@@ -76,19 +97,6 @@ def generate_grid(width, height):
 
     return grid
 
-def is_maze_done(grid):
-    """
-    Returns True if and only if the specified grid only contains -1 and 0.
-    This means the randomized Kruskal's maze generation algorithm is completed.
-    """
-
-    for line in grid:
-        for cell in line:
-            if cell != -1 and cell != 0:
-                return False
-
-    return True
-
 def get_adjacent_cells(grid, x, y):
     """
     Returns all the adjacent valid cells to the one with the specified coordinates.
@@ -129,17 +137,28 @@ def propagate(grid, x, y):
         if grid[cell[1]][cell[0]] > minimum:
             propagate(grid, cell[0], cell[1])
 
-def generate_maze(width, height):
+def generate_maze(width, height, progress=None, cancel=None):
     """
     Generates a maze of the specified size using a derived and randomized form of Kruskal's maze generation algorithm.
     The grid returned is a two-dimensional list of integers.
     Its first dimension is of size the height specified and its second of size the width specified.
     -1 represents walls, spaces (" ") represent open cells.
+    The progress function, if specified, is called regularly with the fraction of the passages already opened.
+    The generation is stopped and None is returned shortly after the cancel event, if specified, is set.
     """
 
     grid = generate_grid(width, height)
 
-    while not is_maze_done(grid):
+    # Each passage opened merges two sets of cells, so the maze is done once width * height - 1 passages are opened.
+    opened, total, tries = 0, width * height - 1, 0
+    while opened < total:
+        tries += 1
+        if tries % CHECK_INTERVAL == 0:
+            if cancel is not None and cancel.is_set():
+                return None
+            if progress is not None:
+                progress(opened / total)
+
         if random.getrandbits(1):
             # Horizontal
             x = random.randrange(width) * 2 + 1
@@ -156,6 +175,10 @@ def generate_maze(width, height):
                 continue
 
         propagate(grid, x, y)
+        opened += 1
+
+    if progress is not None:
+        progress(1)
 
     for y in range(1, height * 2):
         for x in range(1, width * 2):
@@ -164,13 +187,34 @@ def generate_maze(width, height):
 
     return grid
 
+def get_character(cell):
+    """
+    Returns the character used to display the specified cell.
+    Cells with -1 are replaced with stars ("*").
+    Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    """
+
+    characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
+    if cell == -1:
+        return "*"
+    elif type(cell) is int:
+        return characters[min(cell, len(characters) - 1)]
+    else:
+        return str(cell)
+
 def display_maze(screen, grid, title=None):
     """
     Displays the specified maze.
     Cells with -1 are replaced with stars ("*").
     Numbers above 9 are replaced with letters, or plus ("+") if they are above 61.
+    All the cells are drawn as items of a single canvas, which can be scrolled if the maze is larger than the window.
+    Returns the canvas and the flat list of the ids of its items, where the cell (x, y) is at the index x + y * len(grid[0]).
+    Mazes with more than BITMAP_CELLS cells are displayed by display_bitmap instead.
     """
 
+    if len(grid) * len(grid[0]) > BITMAP_CELLS:
+        return display_bitmap(screen, grid, title)
+
     for widget in screen.winfo_children():
         widget.destroy()
 
@@ -178,25 +222,131 @@ def display_maze(screen, grid, title=None):
 
     if title is not None:
         titleLabel = tkinter.Label(frame, text=title)
-        titleLabel.grid(row=0, column=0, columnspan=len(grid[0]))
+        titleLabel.grid(row=0, column=0, columnspan=2)
 
-    characters = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz+"
+    width, height = len(grid[0]) * CELL_SIZE, len(grid) * CELL_SIZE
+    mazeCanvas = tkinter.Canvas(frame, width=width, height=height, scrollregion=(0, 0, width, height), highlightthickness=0)
+
+    xScrollbar = tkinter.Scrollbar(frame, orient=tkinter.HORIZONTAL, command=mazeCanvas.xview)
+    yScrollbar = tkinter.Scrollbar(frame, orient=tkinter.VERTICAL, command=mazeCanvas.yview)
+    mazeCanvas.configure(xscrollcommand=xScrollbar.set, yscrollcommand=yScrollbar.set)
+
+    items = []
     for y, line in enumerate(grid):
         for x, cell in enumerate(line):
-            if cell == -1:
-                cell = "*"
-            elif type(cell) is int:
-                cell = characters[min(cell, len(characters) - 1)]
-            else:
-                cell = str(cell)
+            items.append(mazeCanvas.create_text((x + 0.5) * CELL_SIZE, (y + 0.5) * CELL_SIZE, text=get_character(cell)))
 
-            cellLabel = tkinter.Label(frame, textvariable=tkinter.StringVar(frame, cell))
-            cellLabel.grid(row=y + 1, column=x)
+    mazeCanvas.grid(row=1, column=0, sticky=tkinter.NSEW)
+    yScrollbar.grid(row=1, column=1, sticky=tkinter.NS)
+    xScrollbar.grid(row=2, column=0, sticky=tkinter.EW)
+    frame.grid_rowconfigure(1, weight=1)
+    frame.grid_columnconfigure(0, weight=1)
 
     frame.grid(row=0, column=0)
     screen.grid_rowconfigure(0, weight=1)
     screen.grid_columnconfigure(0, weight=1)
 
+    return mazeCanvas, items
+
+def draw_cells(canvas, items, grid, cells):
+    """
+    Draws again only the specified cells of a maze displayed by display_maze, by changing the text of their items in the canvas.
+    If the maze is displayed as an image, the cells are drawn again on its overlay instead.
+    """
+
+    if type(items) is dict:
+        draw_overlay(canvas, items, grid, cells)
+        return
+
+    for x, y in cells:
+        canvas.itemconfigure(items[x + y * len(grid[0])], text=get_character(grid[y][x]))
+
+def display_bitmap(screen, grid, title=None):
+    """
+    Displays the specified maze as an image, where each cell is a pixel whose color is given by COLORS.
+    The image is built one row of pixels at a time, then zoomed using a scale below it, so the number of widgets doesn't depend on the size of the maze.
+    The entrance ("A"), the exit ("B"), the dots (".") and the player ("X") are drawn as rectangles of an overlay above the image, so they can be changed without drawing the image again.
+    Returns the canvas and a dictionary containing the zoom, the images and the ids of the rectangles of the overlay by coordinates.
+    """
+
+    for widget in screen.winfo_children():
+        widget.destroy()
+
+    frame = tkinter.Frame(screen)
+
+    if title is not None:
+        titleLabel = tkinter.Label(frame, text=title)
+        titleLabel.grid(row=0, column=0, columnspan=2)
+
+    image = tkinter.PhotoImage(width=len(grid[0]), height=len(grid))
+    bitmap = {"zoom": 1, "images": [image, image], "overlay": {}}
+
+    mazeCanvas = tkinter.Canvas(frame, width=len(grid[0]), height=len(grid), scrollregion=(0, 0, len(grid[0]), len(grid)), highlightthickness=0)
+    imageItem = mazeCanvas.create_image(0, 0, image=image, anchor=tkinter.NW)
+
+    cells = []
+    for y, line in enumerate(grid):
+        image.put("{" + " ".join(COLORS[cell] if cell == -1 else "#ffffff" for cell in line) + "}", to=(0, y))
+        cells.extend((x, y) for x, cell in enumerate(line) if cell in ("A", "B", ".", "X"))
+
+    draw_overlay(mazeCanvas, bitmap, grid, cells)
+
+    def zoom_callback(value):
+        zoom = int(value)
+        if zoom == bitmap["zoom"]:
+            return
+
+        # Only the image is zoomed again, the rectangles of the overlay are moved and resized.
+        bitmap["images"][1] = image.zoom(zoom)
+        mazeCanvas.itemconfigure(imageItem, image=bitmap["images"][1])
+        mazeCanvas.scale("overlay", 0, 0, zoom / bitmap["zoom"], zoom / bitmap["zoom"])
+        mazeCanvas.configure(scrollregion=(0, 0, len(grid[0]) * zoom, len(grid) * zoom))
+        bitmap["zoom"] = zoom
+
+    xScrollbar = tkinter.Scrollbar(frame, orient=tkinter.HORIZONTAL, command=mazeCanvas.xview)
+    yScrollbar = tkinter.Scrollbar(frame, orient=tkinter.VERTICAL, command=mazeCanvas.yview)
+    mazeCanvas.configure(xscrollcommand=xScrollbar.set, yscrollcommand=yScrollbar.set)
+
+    zoomScale = tkinter.Scale(frame, from_=1, to=max(BITMAP_SIZE // max(len(grid), len(grid[0])), 1), label="Zoom", orient=tkinter.HORIZONTAL, takefocus=0, command=zoom_callback)
+
+    mazeCanvas.grid(row=1, column=0, sticky=tkinter.NSEW)
+    yScrollbar.grid(row=1, column=1, sticky=tkinter.NS)
+    xScrollbar.grid(row=2, column=0, sticky=tkinter.EW)
+    zoomScale.grid(row=3, column=0, columnspan=2)
+    frame.grid_rowconfigure(1, weight=1)
+    frame.grid_columnconfigure(0, weight=1)
+
+    frame.grid(row=0, column=0, sticky=tkinter.NSEW)
+    screen.grid_rowconfigure(0, weight=1)
+    screen.grid_columnconfigure(0, weight=1)
+
+    return mazeCanvas, bitmap
+
+def draw_overlay(canvas, bitmap, grid, cells):
+    """
+    Draws again the specified cells on the overlay of a maze displayed by display_bitmap.
+    The entrance ("A"), the exit ("B"), the dots (".") and the player ("X") are drawn as rectangles of the size of a zoomed pixel, other cells are removed from the overlay.
+    As the player moves over the entrance, it is never drawn in the image itself, otherwise it would be hidden once the player leaves it.
+    """
+
+    zoom, overlay = bitmap["zoom"], bitmap["overlay"]
+    for x, y in cells:
+        if (x, y) in overlay:
+            canvas.delete(overlay.pop((x, y)))
+
+        if grid[y][x] in ("A", "B", ".", "X"):
+            overlay[(x, y)] = canvas.create_rectangle(x * zoom, y * zoom, (x + 1) * zoom, (y + 1) * zoom, fill=COLORS[grid[y][x]], outline="", tags="overlay")
+
+def scroll_to_cell(canvas, grid, x, y):
+    """
+    Scrolls the specified canvas displayed by display_maze so that the cell (x, y) is visible.
+    The canvas doesn't move while the cell is already visible, otherwise it is centered on the cell.
+    """
+
+    for (first, last), moveto, position, size in [(canvas.xview(), canvas.xview_moveto, x, len(grid[0])), (canvas.yview(), canvas.yview_moveto, y, len(grid))]:
+        if position / size < first or (position + 1) / size > last:
+            moveto(max(position / size - (last - first) / 2, 0))
+
 def input_points(screen, grid, callback):
     """
     Inputs and returns four integers from the user.
@@ -325,30 +475,20 @@ def get_path(grid, distances, x, y):
 
     return solution
 
-def rollback(distances, x, y, n):
+def rollback(distances, path, n):
     """
-    Traces back the path from the specified coordinates to the point of distance n.
-    Returns the grid specified, with -1 along the path.
-    WARNING: The distances should only describe one path of decrementing integers from the specified coordinates.
-             Otherwise, the behavior is undefined and the function may return None.
+    Undoes the moves of the specified path after the point of distance n, by removing them from the path and resetting their distance to -1.
+    The path and the distances are modified in place, and only the removed cells are visited.
+    Returns the list of the removed coordinates.
     """
 
-    distances = [line.copy() for line in distances]
+    removed = []
+    while len(path) > n + 1:
+        x, y = path.pop()
+        distances[y][x] = -1
+        removed.append((x, y))
 
-    d = distances[y][x]
-    distances[y][x] = -1
-
-    while d > n:
-        for cell in get_adjacent_cells(distances, x, y):
-            if distances[cell[1]][cell[0]] == d - 1:
-                x, y = cell
-                distances[y][x] = -1
-                d -= 1
-                break
-        else:
-            return None
-
-    return distances
+    return removed
 
 def player_solve_maze(screen, grid, xA, yA, xB, yB, callback):
     """
@@ -361,33 +501,43 @@ def player_solve_maze(screen, grid, xA, yA, xB, yB, callback):
     distances = [[-1] * len(line) for line in grid]
     distances[yA][xA] = 0
 
-    def move_callback(distances, x, y, d, found, explored, dx, dy):
+    # The path of the user is kept as a stack of coordinates, and drawn on a copy of the grid which is updated at each move.
+    path, solution = [(xA, yA)], [line.copy() for line in grid]
+
+    def move_callback(x, y, explored, dx, dy):
         if y + dy < 0 or y + dy >= len(grid) or x + dx < 0 or x + dx >= len(grid[y + dy]) or grid[y + dy][x + dx] == -1:
-            input_move(screen, lambda dx, dy: move_callback(distances, x, y, d, found, explored, dx, dy))
+            input_move(screen, lambda dx, dy: move_callback(x, y, explored, dx, dy))
             return
 
+        changed = [(x, y), (x + dx, y + dy)]
         if distances[y + dy][x + dx] != -1:
-            d = distances[y + dy][x + dx]
-            rollback(distances, x, y, d)
+            for px, py in rollback(distances, path, distances[y + dy][x + dx]):
+                solution[py][px] = grid[py][px]
+                changed.append((px, py))
+        else:
+            solution[y][x] = "." if grid[y][x] == " " else grid[y][x]
+            path.append((x + dx, y + dy))
+            distances[y + dy][x + dx] = len(path) - 1
 
         x += dx
         y += dy
-        distances[y][x] = d
         explored += 1
-        d += 1
 
         if x == xB and y == yB:
-            callback(explored, distances[yB][xB], get_path(grid, distances, xB, yB))
+            callback(explored, len(path) - 1, solution)
             return
 
-        solution = get_path(grid, distances, x, y)
-        if solution is not None:
-            solution[y][x] = "X"
-            display_maze(screen, solution)
+        solution[y][x] = "X"
+        draw_cells(canvas, items, solution, changed)
+        scroll_to_cell(canvas, solution, x, y)
 
-        input_move(screen, lambda dx, dy: move_callback(distances, x, y, d, found, explored, dx, dy))
+        input_move(screen, lambda dx, dy: move_callback(x, y, explored, dx, dy))
 
-    move_callback(distances, xA, yA, 1, False, 0, 0, 0)
+    # The maze is only displayed once, then only the items of the cells modified by each move are changed.
+    solution[yA][xA] = "X"
+    canvas, items = display_maze(screen, solution)
+
+    input_move(screen, lambda dx, dy: move_callback(xA, yA, 0, dx, dy))
 
 def computer_solve_maze(grid, xA, yA, xB, yB):
     """
@@ -413,6 +563,69 @@ def computer_solve_maze(grid, xA, yA, xB, yB):
 
     return explored, distances[yB][xB], get_path(grid, distances, xB, yB)
 
+def generate_maze_in_background(screen, width, height, callback):
+    """
+    Generates a maze of the specified size in a background thread, while displaying a progress bar so that the window never freezes.
+    Then, calls the callback with the generated grid, or with None if the user cancelled the generation or if it failed.
+    """
+
+    fraction, cancel = 0, threading.Event()
+
+    def progress_callback(value):
+        nonlocal fraction
+        fraction = value
+
+    future = concurrent.futures.Future()
+
+    def generate():
+        try:
+            future.set_result(generate_maze(width, height, progress_callback, cancel))
+        except Exception as e:
+            future.set_exception(e)
+
+    # Unlike the threads of an executor, a daemon thread isn't waited for when the program exits, for example when the window is closed during the generation.
+    threading.Thread(target=generate, daemon=True).start()
+
+    def poll_callback():
+        if not future.done():
+            generationProgressbar["value"] = fraction
+            screen.after(PROGRESS_DELAY, poll_callback)
+            return
+
+        for widget in screen.winfo_children():
+            widget.destroy()
+
+        screen.grid_rowconfigure(0, weight=0)
+        screen.grid_rowconfigure(4, weight=0)
+        screen.grid_columnconfigure(0, weight=0)
+        screen.grid_columnconfigure(2, weight=0)
+
+        # If the generation failed, the error is reported and the size is asked again, as if it was cancelled.
+        try:
+            grid = future.result()
+        except Exception:
+            messagebox.showerror("Labyrinth Project", "ERROR!\nThe labyrinth could not be generated:\n" + traceback.format_exc())
+            grid = None
+
+        callback(grid)
+
+    titleLabel = tkinter.Label(screen, text="Generating your labyrinth...")
+    titleLabel.grid(row=1, column=1)
+
+    generationProgressbar = ttk.Progressbar(screen, length=300, maximum=1)
+    generationProgressbar.grid(row=2, column=1)
+    generationProgressbar.bind("<Destroy>", lambda event: cancel.set())
+
+    cancelButton = tkinter.Button(screen, text="Cancel", command=cancel.set)
+    cancelButton.grid(row=3, column=1)
+
+    screen.grid_rowconfigure(0, weight=1)
+    screen.grid_rowconfigure(4, weight=1)
+    screen.grid_columnconfigure(0, weight=1)
+    screen.grid_columnconfigure(2, weight=1)
+
+    screen.after(PROGRESS_DELAY, poll_callback)
+
 def input_maze(screen, callback):
     """
     Inputs the required information from the user to generate a maze.
@@ -421,7 +634,54 @@ def input_maze(screen, callback):
     The entrance and exit are marked with "A" and "B" respectively.
     """
 
-    input_maze_size(screen, lambda width, height: input_points(screen, generate_maze(width, height), callback))
+    def generate_callback(grid):
+        # The size is asked again if the user cancelled the generation.
+        if grid is None:
+            input_maze(screen, callback)
+        else:
+            input_points(screen, grid, callback)
+
+    input_maze_size(screen, lambda width, height: generate_maze_in_background(screen, width, height, generate_callback))
+
+def start_solving(grid, xA, yA, xB, yB):
+    """
+    Starts finding the optimal solution of the specified maze grid in a background thread, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    Returns a future of the result of computer_solve_maze, so the user can start playing right away and the solution is only waited for when it is needed.
+    """
+
+    future = concurrent.futures.Future()
+
+    def solve():
+        try:
+            future.set_result(computer_solve_maze(grid, xA, yA, xB, yB))
+        except Exception as e:
+            future.set_exception(e)
+
+    # As in generate_maze_in_background, a daemon thread doesn't keep the program running once the window is closed.
+    threading.Thread(target=solve, daemon=True).start()
+
+    return future
+
+def wait_for_solution(screen, future, callback):
+    """
+    Waits for the specified future returned by start_solving without freezing the window, by checking it periodically.
+    Then, calls the callback with the number of cells explored by the algorithm, the length of the shortest path, as well as the path itself.
+    """
+
+    if not future.done():
+        screen.after(PROGRESS_DELAY, lambda: wait_for_solution(screen, future, callback))
+        return
+
+    try:
+        computer_explored, computer_length, computer_solution = future.result()
+    except Exception:
+        messagebox.showerror("Labyrinth Project", "ERROR!\nThe shortest path could not be found:\n" + traceback.format_exc())
+        return
+
+    if computer_solution is not None:
+        callback(computer_explored, computer_length, computer_solution)
+    else:
+        print("No solution found to the maze.")
 
 def play(screen, grid, xA, yA, xB, yB):
     """
@@ -429,14 +689,17 @@ def play(screen, grid, xA, yA, xB, yB):
     Then, performs as requested using the specified information, and outputs some statistics.
     """
 
+    # The shortest path is searched while the user answers and plays, and only waited for when it is needed.
+    future = start_solving(grid, xA, yA, xB, yB)
+
     answer = messagebox.askyesno("Labyrinth Project", "Do you want to solve the maze (Yes) or want the computer to give you the solution (No)?")
 
-    computer_explored, computer_length, computer_solution = computer_solve_maze(grid, xA, yA, xB, yB)
-    if computer_solution is not None:
-        if answer:
-            def player_solve_maze_callback(explored, length, solution):
-                end = time.time()
-                elapsed = end - start
+    if answer:
+        def player_solve_maze_callback(explored, length, solution):
+            end = time.time()
+            elapsed = end - start
+
+            def computer_solve_maze_callback(computer_explored, computer_length, computer_solution):
                 score = computer_length / length * 2 ** -(elapsed / (len(grid) * len(grid[0]))) * 100
 
                 display_maze(screen, computer_solution, "Here was the shortest path:")
@@ -444,13 +707,16 @@ def play(screen, grid, xA, yA, xB, yB):
                 print("Number of explored cells to find the shortest path: {}\nLength of the shortest path: {}\n".format(computer_explored, computer_length))
                 print("Score: {:.2f} points".format(score))
 
-            start = time.time()
-            player_solve_maze(screen, grid, xA, yA, xB, yB, player_solve_maze_callback)
-        else:
+            wait_for_solution(screen, future, computer_solve_maze_callback)
+
+        start = time.time()
+        player_solve_maze(screen, grid, xA, yA, xB, yB, player_solve_maze_callback)
+    else:
+        def computer_solve_maze_callback(computer_explored, computer_length, computer_solution):
             display_maze(screen, computer_solution, "Here is the shortest path:")
             print("Number of explored cells to find the path: {}\nLength of the shortest path: {}".format(computer_explored, computer_length))
-    else:
-        print("No solution found to the maze.")
+
+        wait_for_solution(screen, future, computer_solve_maze_callback)
 
 def main():
     """
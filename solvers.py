@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+import collections
+import multiprocessing
+from queue import Empty
+import labyrinth
+import labyrinth3_2
+import labyrinth3_3
+import labyrinth3_5
+
+# Each solver is associated with True if it always finds the shortest path, or False if it only does in mazes without cycles.
+SOLVERS = [(labyrinth3_2.solve_maze, True), (labyrinth3_3.solve_maze, False), (labyrinth.jps_solve_maze, True)]
+
+# Number of times each solver was chosen by solve, by name.
+decisions = collections.Counter()
+
+def count_components(grid):
+    """
+    Returns the number of groups of open cells of the specified maze grid which are connected to each other, but not to the other groups.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    visited = [[cell == -1 for cell in line] for line in grid]
+
+    components = 0
+    for y in range(len(grid)):
+        for x in range(len(grid[y])):
+            if visited[y][x]:
+                continue
+
+            components += 1
+            visited[y][x] = True
+            pending = [(x, y)]
+            while pending:
+                cx, cy = pending.pop()
+                for nx, ny in labyrinth.get_adjacent_cells(grid, cx, cy):
+                    if not visited[ny][nx]:
+                        visited[ny][nx] = True
+                        pending.append((nx, ny))
+
+    return components
+
+def count_cycles(grid):
+    """
+    Returns the number of independent cycles in the specified maze grid, which is 0 if and only if there is only one path between any two connected cells.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    cells, passages, previous = 0, 0, None
+    for line in grid:
+        current = [cell != -1 for cell in line]
+        cells += sum(current)
+        passages += sum(a and b for a, b in zip(current, current[1:]))
+        if previous is not None:
+            passages += sum(a and b for a, b in zip(previous, current))
+        previous = current
+
+    # Each group of connected cells without cycles has one passage less than its number of cells.
+    return passages - cells + count_components(grid)
+
+def run_solver(queue, index, solver, exact, grid, xA, yA, xB, yB):
+    """
+    Runs the specified solver on the specified maze, and sends its result to the specified queue along with its index.
+    The result is replaced with None if the solver isn't exact and the maze contains cycles, as the path found may not be the shortest one, or if the solver fails.
+    """
+
+    # A solver which fails must still send a result, otherwise the parent would wait for it forever.
+    try:
+        explored, length, solution = solver(grid, xA, yA, xB, yB)
+    except Exception:
+        queue.put((index, None))
+        return
+
+    if length == -1:
+        solution = None
+
+    if not exact and (solution is None or count_cycles(grid) > 0):
+        queue.put((index, None))
+    else:
+        queue.put((index, (explored, length, solution)))
+
+def portfolio_solve_maze(grid, xA, yA, xB, yB, solvers=SOLVERS):
+    """
+    Finds the optimal solution of the specified maze grid, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    All the specified solvers are run at the same time in separate processes, and the first result known to be the shortest path is returned.
+    The other solvers are then stopped.
+    Returns the number of cells explored by the fastest solver, the length of the shortest path, as well as the path itself.
+    Assumes -1 represents walls and anything else represents open cells.
+    The returned grid contains dots (".") along the path, or is None if the exit cannot be reached.
+    Raises a RuntimeError if every solver failed or only gave results which may not be the shortest path.
+    """
+
+    # When possible, the processes are forked so that they share the memory of the grid instead of receiving a copy of it.
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+
+    queue = context.Queue()
+    processes = []
+    for index, (solver, exact) in enumerate(solvers):
+        process = context.Process(target=run_solver, args=(queue, index, solver, exact, grid, xA, yA, xB, yB), daemon=True)
+        process.start()
+        processes.append(process)
+
+    result, received = None, 0
+    try:
+        while received < len(processes) and result is None:
+            try:
+                index, result = queue.get(timeout=0.1)
+                received += 1
+            except Empty:
+                # Workers killed without sending their result, for example by a signal, are not waited for.
+                if not any(process.is_alive() for process in processes) and queue.empty():
+                    break
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    # Unlike a solver which couldn't reach the exit, no result at all doesn't mean the exit is unreachable.
+    if result is None:
+        raise RuntimeError("None of the solvers found a result known to be the shortest path.")
+
+    return result
+
+def maze_statistics(grid, xA, yA, xB, yB, cycles=None):
+    """
+    Returns a dictionary of statistics about the specified maze, used to choose the fastest solver which always finds the shortest path.
+    The number of cycles is counted if it isn't specified, but should be passed when known, for example the one given to labyrinth3_5.generate_maze.
+    """
+
+    if cycles is None:
+        cycles = count_cycles(grid)
+
+    size = len(grid) * len(grid[0])
+
+    return {
+        "size": size,
+        "side": min(len(grid), len(grid[0])),
+        "cycles": cycles,
+        "density": cycles / size,
+        "distance": abs(xB - xA) + abs(yB - yA),
+    }
+
+def solve(grid, xA, yA, xB, yB, cycles=None):
+    """
+    Finds the optimal solution of the specified maze grid, where the starting point is (xA, yA) and the exit has coordinates (xB, yB).
+    The solver is chosen using the statistics of the maze, and its name is counted in decisions.
+    Returns the number of cells explored by the algorithm, the length of the shortest path, as well as the path itself.
+    Assumes -1 represents walls and anything else represents open cells.
+    """
+
+    statistics = maze_statistics(grid, xA, yA, xB, yB, cycles)
+
+    # Jump point search stops early when the points are close, but explores more slowly than the breadth-first search on bits, whose rows are bounded by the smaller side of the grid.
+    # Dense cycles open up the maze and make the jumps longer, so the distance up to which jump point search is faster grows with the density.
+    # Following the right hand along the walls of a maze without cycles was measured to be slower on average, as it may walk along the whole maze before reaching the exit.
+    if statistics["distance"] <= statistics["side"] * (1 + 2 * statistics["density"]):
+        solver = labyrinth.jps_solve_maze
+    else:
+        solver = labyrinth.bitset_solve_maze
+
+    decisions[solver.__module__ + "." + solver.__name__] += 1
+
+    return solver(grid, xA, yA, xB, yB)
+
+def main():
+    sys.setrecursionlimit(100000)
+
+    n = 100
+    width, height, cycles = 50, 50, 100
+    xA, yA, xB, yB = 1, 0, 100, 99
+
+    total = 0
+    for t in range(n):
+        grid = labyrinth3_5.generate_maze(width, height, cycles)
+        grid[yA][xA] = "A"
+        grid[yB][xB] = "B"
+
+        start = time.time()
+        explored, length, solution = portfolio_solve_maze(grid, xA, yA, xB, yB)
+        total += time.time() - start
+
+        print("\rProgress: %d / %d (%f%%)" % (t + 1, n, (t + 1) / n * 100), end="")
+    print()
+
+    print("Portfolio: %f average execution time" % (total / n))
+
+if __name__ == "__main__":
+    main()